@@ -6,6 +6,7 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import argparse
+import hashlib
 from datetime import datetime
 import os
 
@@ -120,38 +121,78 @@ def run_backtest(price_data, factors, args):
     
     return results
 
+def data_fingerprint(*frames):
+    """Hash the contents (values and index) of one or more DataFrames."""
+    digest = hashlib.sha1()
+    for frame in frames:
+        digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def load_or_compute(name, key, compute):
+    """Load an analysis result from the on-disk cache, computing and saving it on a miss."""
+    cache_file = os.path.join(DATA_CONFIG['data_dir'], 'processed', f"{name}_{key}.pkl")
+    
+    # Check if cached result exists
+    try:
+        return pd.read_pickle(cache_file)
+    except FileNotFoundError:
+        pass
+    
+    result = compute()
+    
+    # Save to cache
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    pd.to_pickle(result, cache_file)
+    
+    return result
+
 def analyze_performance(price_data, factors, results, args):
     """Analyze strategy performance and generate visualizations."""
     print("Analyzing performance...")
     
     # Initialize performance metrics calculator
     metrics_calculator = PerformanceMetrics(price_data)
+    factor_data = factors[args.factor]
+    
+    # Expensive factor evaluations are cached on disk, keyed by the input data
+    data_key = data_fingerprint(factor_data, price_data)
     
     # Calculate factor returns
-    factor_returns = metrics_calculator.calculate_factor_returns(
-        factor_data=factors[args.factor],
-        n_quantiles=5,
-        holdings_period=20
+    factor_returns = load_or_compute(
+        f"{args.factor}_factor_returns", f"{data_key}_q5_h20",
+        lambda: metrics_calculator.calculate_factor_returns(
+            factor_data=factor_data,
+            n_quantiles=5,
+            holdings_period=20
+        )
     )
     
     # Calculate information coefficient
-    ic_series = metrics_calculator.calculate_information_coefficient(
-        factor_data=factors[args.factor],
-        forward_period=20
+    ic_series = load_or_compute(
+        f"{args.factor}_ic", f"{data_key}_f20",
+        lambda: metrics_calculator.calculate_information_coefficient(
+            factor_data=factor_data,
+            forward_period=20
+        )
     )
     
     # Calculate factor decay
-    factor_decay = metrics_calculator.calculate_factor_decay(
-        factor_data=factors[args.factor],
-        max_periods=60,
-        step=5
+    factor_decay = load_or_compute(
+        f"{args.factor}_factor_decay", f"{data_key}_m60_s5",
+        lambda: metrics_calculator.calculate_factor_decay(
+            factor_data=factor_data,
+            max_periods=60,
+            step=5
+        )
     )
     
     # Initialize performance visualizer
     visualizer = PerformanceVisualizer(figsize=VIZ_CONFIG['figsize'])
     
-    # Calculate daily returns
-    daily_returns = results['portfolio_value'].pct_change(fill_method=None).dropna()
+    # Calculate daily returns (dates after the backtest end have no value)
+    portfolio_value = results['portfolio_value'].dropna()
+    pv = portfolio_value.to_numpy(dtype=np.float64)
+    daily_returns = pd.Series(np.diff(pv) / pv[:-1], index=portfolio_value.index[1:])
     
     # Plot cumulative returns
     cum_returns_fig = visualizer.plot_cumulative_returns(
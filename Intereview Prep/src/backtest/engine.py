@@ -2,6 +2,44 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+from src.backtest.metrics import calculate_drawdowns
+from src.jit import njit
+
+
+@njit(cache=True)
+def _calc_weights_nb(factors, market_neutral):
+    """
+    Compiled kernel for BacktestEngine._calculate_weights.
+    
+    Parameters:
+    -----------
+    factors : numpy.ndarray
+        1-D float64 array of factor values.
+    market_neutral : bool
+        Whether to also short the bottom 20% of stocks.
+        
+    Returns:
+    --------
+    numpy.ndarray
+        Array of portfolio weights aligned with ``factors``.
+    """
+    n = factors.size
+    weights = np.zeros(n)
+    if n == 0:
+        return weights
+    
+    # Only the top and bottom groups are needed, so select them with an
+    # O(n) partition instead of sorting the whole universe
+    k = max(int(n * 0.2), 1)
+    top = np.argpartition(factors, n - k)[n - k:]
+    weights[top] = 1.0 / k  # Long positions in the top 20%
+    if market_neutral:
+        bottom = np.argpartition(factors, k - 1)[:k]
+        weights[bottom] = -1.0 / k  # Short positions in the bottom 20%
+    
+    return weights
+
+
 class BacktestEngine:
     """
     Engine for backtesting factor-based trading strategies.
@@ -26,6 +64,10 @@ class BacktestEngine:
         self.portfolio_value = None
         self.performance_metrics = None
         
+        # Sorted trading dates and memoized rebalance schedules
+        self._all_dates = price_data.index.get_level_values('Date').unique().sort_values()
+        self._rebalance_dates_cache = {}
+        
     def generate_rebalance_dates(self, start_date, end_date):
         """
         Generate rebalance dates based on the specified frequency.
@@ -46,9 +88,31 @@ class BacktestEngine:
             start_date = pd.Timestamp(start_date)
         if isinstance(end_date, str):
             end_date = pd.Timestamp(end_date)
+        
+        # Reuse the schedule if it has already been generated
+        cache_key = (start_date, end_date, self.rebalance_frequency)
+        if cache_key not in self._rebalance_dates_cache:
+            self._rebalance_dates_cache[cache_key] = self._generate_rebalance_dates(start_date, end_date)
+        
+        return self._rebalance_dates_cache[cache_key].copy()
+    
+    def _generate_rebalance_dates(self, start_date, end_date):
+        """
+        Generate rebalance dates without consulting the cache.
+        
+        Parameters:
+        -----------
+        start_date : pandas.Timestamp
+            Start date for the backtest.
+        end_date : pandas.Timestamp
+            End date for the backtest.
             
-        all_dates = self.price_data.index.get_level_values('Date').unique()
-        all_dates = all_dates.sort_values()
+        Returns:
+        --------
+        list
+            List of rebalance dates.
+        """
+        all_dates = self._all_dates
         
         # Filter dates within the backtest range
         valid_dates = all_dates[(all_dates >= start_date) & (all_dates <= end_date)]
@@ -64,15 +128,15 @@ class BacktestEngine:
         elif self.rebalance_frequency == 'monthly':
             # Get dates with day <= 7 (first week of month)
             first_week_dates = dates_series[dates_series.dt.day <= 7]
-            # Create year-month string for groupby
-            year_month = first_week_dates.dt.strftime('%Y-%m')
+            # Create integer year-month key (e.g. 202401) for groupby
+            year_month = first_week_dates.dt.year * 100 + first_week_dates.dt.month
             # Group by year-month and get first date in each group
             return first_week_dates.groupby(year_month).first().values
         elif self.rebalance_frequency == 'quarterly':
             # Get dates with day <= 7 (first week of month)
             first_week_dates = dates_series[dates_series.dt.day <= 7]
-            # Create year-quarter string for groupby
-            year_quarter = first_week_dates.dt.strftime('%Y-Q') + ((first_week_dates.dt.month - 1) // 3 + 1).astype(str)
+            # Create integer year-quarter key (e.g. 20241) for groupby
+            year_quarter = first_week_dates.dt.year * 10 + (first_week_dates.dt.month - 1) // 3 + 1
             # Group by year-quarter and get first date in each group
             return first_week_dates.groupby(year_quarter).first().values
         else:
@@ -128,12 +192,30 @@ class BacktestEngine:
         # Get all trading days for the backtest period (starting at first rebalance)
         backtest_dates = close_prices.index[close_prices.index >= first_trading_day]
         
-        # Initialize portfolio values and positions only for relevant dates
-        portfolio_values = pd.Series(index=backtest_dates)
-        positions = pd.DataFrame(0.0, index=backtest_dates, columns=close_prices.columns)
+        # Precompute daily stock returns once; row k holds the return into backtest_dates[k]
+        stock_returns_arr = close_prices.pct_change(fill_method=None).loc[backtest_dates].to_numpy()
+        
+        # Initialize portfolio values and positions only for relevant dates.
+        # Both are kept as contiguous NumPy arrays during the simulation and
+        # wrapped back into pandas objects once the loop has finished.
+        universe = close_prices.columns
+        pos_arr = np.zeros((len(backtest_dates), len(universe)), dtype=np.float64)
+        pv_arr = np.full(len(backtest_dates), np.nan)
+        date_to_i = {date: i for i, date in enumerate(backtest_dates)}
         
         # Set initial portfolio value
-        portfolio_values.iloc[0] = 1.0  # Initialize with $1
+        pv_arr[0] = 1.0  # Initialize with $1
+        
+        # Materialize factor values once so each rebalance is a positional row lookup
+        factor_values = factor_data.to_numpy(dtype=np.float64)
+        factor_columns = factor_data.columns
+        factor_row = {date: i for i, date in enumerate(factor_data.index)}
+        
+        # Position of each factor column in the fixed stock universe, so weights
+        # can be scattered into dense arrays without reindexing; -1 marks
+        # factor tickers with no price data, which cannot hold a position
+        factor_to_universe = universe.get_indexer(factor_columns)
+        known_stocks = factor_to_universe >= 0
         
         # Track positions for performance attribution
         position_history = []
@@ -157,22 +239,28 @@ class BacktestEngine:
             if i > 0:
                 prev_trading_days = close_prices.index[close_prices.index < trading_day]
                 if len(prev_trading_days) > 0:
-                    prev_trading_day = prev_trading_days[-1]  # Get the most recent previous trading day
-                    old_positions = positions.loc[prev_trading_day]
-                    prev_portfolio_value = portfolio_values.loc[prev_trading_day]
+                    prev_i = date_to_i[prev_trading_days[-1]]  # Row of the most recent previous trading day
+                    old_positions = pos_arr[prev_i]
+                    prev_portfolio_value = pv_arr[prev_i]
                 else:
-                    old_positions = 0
+                    old_positions = None
                     prev_portfolio_value = 1.0
             else:
-                old_positions = 0
+                old_positions = None
                 prev_portfolio_value = 1.0
             
-            # Get factor values for the current rebalance date
-            current_factors = factor_data.loc[trading_day]
+            # Get factor values for the current rebalance date, falling back to
+            # the most recent earlier date if the factor data has no row for it
+            row_i = factor_row.get(trading_day)
+            if row_i is None:
+                row_i = factor_data.index.searchsorted(trading_day, side='right') - 1
+                if row_i < 0:
+                    raise KeyError(f"No factor data available on or before {trading_day}")
+            current_factors = factor_values[row_i]
             
             # Filter out stocks with missing data
-            valid_stocks = ~current_factors.isna()
-            valid_factors = current_factors[valid_stocks]
+            valid_stocks = ~np.isnan(current_factors)
+            valid_factors = pd.Series(current_factors[valid_stocks], index=factor_columns[valid_stocks])
             
             # Calculate weights based on factors
             weights = self._calculate_weights(valid_factors, market_neutral)
@@ -182,26 +270,15 @@ class BacktestEngine:
                 weights = self._apply_position_limits(weights, position_limits)
             
             # Calculate effective weights of current positions before rebalancing
-            if isinstance(old_positions, pd.Series) and prev_portfolio_value > 0:
+            if old_positions is not None and prev_portfolio_value > 0:
                 # Calculate current weights based on current position values 
                 raw_old_weights = old_positions / prev_portfolio_value
                 
                 # For market-neutral portfolios, normalize old weights to ensure they sum to zero
-                if market_neutral and abs(raw_old_weights.sum()) > 1e-10:
-                    # Separate long and short positions
-                    long_weights = raw_old_weights[raw_old_weights > 0]
-                    short_weights = raw_old_weights[raw_old_weights < 0]
-                    
+                if market_neutral and abs(np.nansum(raw_old_weights)) > 1e-10:
                     # If we have both long and short positions, normalize them separately
-                    if len(long_weights) > 0 and len(short_weights) > 0:
-                        # Scale long positions to sum to 1.0
-                        long_weights = long_weights / long_weights.sum()
-                        
-                        # Scale short positions to sum to -1.0
-                        short_weights = short_weights / abs(short_weights.sum()) * -1.0
-                        
-                        # Combine weights
-                        old_weights = pd.concat([long_weights, short_weights])
+                    if (raw_old_weights > 0).any() and (raw_old_weights < 0).any():
+                        old_weights = self._normalize_long_short(raw_old_weights)
                     else:
                         # If we've somehow lost either all long or all short positions
                         old_weights = raw_old_weights
@@ -210,30 +287,33 @@ class BacktestEngine:
                     old_weights = raw_old_weights
             else:
                 # No previous positions
-                old_weights = pd.Series(0.0, index=positions.columns)
+                old_weights = np.zeros(len(universe))
             
             # Calculate turnover properly
-            # 1. Ensure both weight sets are defined on the same universe of stocks
-            combined_index = weights.index.union(old_weights.index)
-            weights_aligned = weights.reindex(combined_index, fill_value=0)
-            old_weights_aligned = old_weights.reindex(combined_index, fill_value=0)
+            # 1. Scatter the new weights onto the fixed universe of stocks
+            #    (weights keep the order of valid_factors); weights on tickers
+            #    without price data are dropped from the positions
+            weight_values = weights.to_numpy()
+            in_universe = known_stocks[valid_stocks]
+            new_weights = np.zeros(len(universe))
+            new_weights[factor_to_universe[valid_stocks][in_universe]] = weight_values[in_universe]
             
-            # 2. Calculate absolute changes in weights (one-way turnover)
-            weight_changes = (weights_aligned - old_weights_aligned).abs()
+            # 2. Calculate absolute changes in weights (one-way turnover);
+            #    stocks without a valid old weight count as unchanged, and
+            #    dropped weights still count as traded
+            weight_changes = np.abs(new_weights - old_weights)
             
             # 3. Compute total turnover - should never exceed 2.0 for market-neutral
-            weight_turnover = weight_changes.sum() / 2
+            weight_turnover = (np.nansum(weight_changes) + np.abs(weight_values[~in_universe]).sum()) / 2
             
             # Calculate transaction costs based on weight turnover
             transaction_costs = weight_turnover * self.transaction_cost * prev_portfolio_value
             
-            # Update positions with new target values
-            new_positions = pd.Series(0.0, index=positions.columns)
-            new_positions[weights.index] = weights.values * prev_portfolio_value
-            
-            # Update portfolio value accounting for transaction costs
-            positions.loc[trading_day] = new_positions
-            portfolio_values.loc[trading_day] = prev_portfolio_value - transaction_costs
+            # Update positions with new target values and portfolio value
+            # accounting for transaction costs
+            day_i = date_to_i[trading_day]
+            pos_arr[day_i] = new_weights * prev_portfolio_value
+            pv_arr[day_i] = prev_portfolio_value - transaction_costs
             
             # Store position details for attribution
             position_history.append({
@@ -243,20 +323,19 @@ class BacktestEngine:
                 'transaction_costs': transaction_costs
             })
             
-            # Calculate returns for each day until the next rebalance
-            for j in range(len(next_trading_dates) - 1):
-                current_date = next_trading_dates[j]
-                next_date = next_trading_dates[j+1]
-                
-                # Calculate stock returns
-                stock_returns = close_prices.loc[next_date] / close_prices.loc[current_date] - 1
-                
-                # Calculate portfolio return
-                portfolio_return = (positions.loc[current_date] * stock_returns).sum()
-                
-                # Update positions and portfolio value
-                positions.loc[next_date] = positions.loc[current_date] * (1 + stock_returns)
-                portfolio_values.loc[next_date] = portfolio_values.loc[current_date] * (1 + portfolio_return)
+            # Mark positions to market for every day until the next rebalance in one block
+            holding = slice(day_i + 1, day_i + len(next_trading_dates))
+            stock_returns = stock_returns_arr[holding]
+            
+            # Positions grow with the cumulative stock returns since the rebalance
+            pos_arr[holding] = pos_arr[day_i] * np.cumprod(1 + stock_returns, axis=0)
+            
+            # Daily portfolio return from the previous day's positions
+            portfolio_returns = np.nansum(pos_arr[day_i:holding.stop - 1] * stock_returns, axis=1)
+            pv_arr[holding] = pv_arr[day_i] * np.cumprod(1 + portfolio_returns)
+        
+        positions = pd.DataFrame(pos_arr, index=backtest_dates, columns=universe)
+        portfolio_values = pd.Series(pv_arr, index=backtest_dates)
         
         # Calculate performance metrics
         self.positions = positions
@@ -294,31 +373,10 @@ class BacktestEngine:
         pandas.Series
             Series with portfolio weights for each ticker.
         """
-        # Sort stocks by factor value
-        sorted_factors = factor_values.sort_values(ascending=False)
-        
-        # Calculate the number of stocks in each 20% group (instead of 10%)
-        num_stocks = len(sorted_factors)
-        quintile_size = max(int(num_stocks * 0.2), 1)
-        
-        # Initialize weights
-        weights = pd.Series(0.0, index=sorted_factors.index)
+        # Equal weight the top (and, if market neutral, bottom) 20% of stocks
+        weights = _calc_weights_nb(factor_values.to_numpy(dtype=np.float64), market_neutral)
         
-        if market_neutral:
-            # Select top and bottom 20% of stocks
-            top_stocks = sorted_factors.iloc[:quintile_size].index
-            bottom_stocks = sorted_factors.iloc[-quintile_size:].index
-            
-            # Equal weight within the top and bottom groups
-            weights[top_stocks] = 1.0 / quintile_size   # Long positions
-            weights[bottom_stocks] = -1.0 / quintile_size  # Short positions
-        else:
-            # For long-only portfolio, use all stocks but focus on top performers
-            # Apply equal weight to top stocks
-            top_stocks = sorted_factors.iloc[:quintile_size].index
-            weights[top_stocks] = 1.0 / quintile_size
-        
-        return weights
+        return pd.Series(weights, index=factor_values.index)
     
     def _apply_position_limits(self, weights, position_limits):
         """
@@ -344,20 +402,9 @@ class BacktestEngine:
         
         # Normalize weights to ensure they sum to zero for market-neutral portfolio
         if abs(weights.sum()) > 1e-10:
-            # Separate long and short positions
-            long_weights = weights[weights > 0]
-            short_weights = weights[weights < 0]
-            
             # If we have both long and short positions, normalize them to ensure dollar neutrality
-            if len(long_weights) > 0 and len(short_weights) > 0:
-                # Scale long positions to sum to 1.0
-                long_weights = long_weights / long_weights.sum()
-                
-                # Scale short positions to sum to -1.0
-                short_weights = short_weights / abs(short_weights.sum()) * -1.0
-                
-                # Combine weights
-                weights = pd.concat([long_weights, short_weights])
+            if (weights > 0).any() and (weights < 0).any():
+                weights = pd.Series(self._normalize_long_short(weights.to_numpy()), index=weights.index)
             else:
                 # If we only have long or short positions (which shouldn't happen in a properly
                 # constructed market-neutral strategy), just normalize to 1 or -1
@@ -365,6 +412,38 @@ class BacktestEngine:
         
         return weights
     
+    def _normalize_long_short(self, weights):
+        """
+        Normalize the long and short legs of a weight vector separately.
+        
+        The scaling is done in place on a single NumPy array, so no masked
+        sub-Series are concatenated and re-aligned. Positions that are
+        neither long nor short (zero or NaN) end up with a weight of zero.
+        
+        Parameters:
+        -----------
+        weights : numpy.ndarray
+            Array with portfolio weights for each ticker.
+            
+        Returns:
+        --------
+        numpy.ndarray
+            Array with normalized weights in the same order.
+        """
+        w = np.array(weights, dtype=np.float64)
+        long_mask = w > 0
+        short_mask = w < 0
+        w[~(long_mask | short_mask)] = 0.0
+        
+        # Scale long positions to sum to 1.0
+        w[long_mask] /= w[long_mask].sum()
+        
+        # Scale short positions to sum to -1.0
+        w[short_mask] /= abs(w[short_mask].sum())
+        w[short_mask] *= -1.0
+        
+        return w
+    
     def _calculate_performance_metrics(self, portfolio_values):
         """
         Calculate performance metrics for the backtest.
@@ -379,24 +458,26 @@ class BacktestEngine:
         dict
             Dictionary with performance metrics.
         """
+        # Work on the raw values (dates past the end of the backtest are NaN)
+        pv = portfolio_values.dropna().to_numpy(dtype=np.float64)
+        
         # Calculate daily returns
-        daily_returns = portfolio_values.pct_change().dropna()
+        daily_returns = np.diff(pv) / pv[:-1]
         
         # Calculate performance metrics
-        total_return = portfolio_values.iloc[-1] / portfolio_values.iloc[0] - 1
+        total_return = pv[-1] / pv[0] - 1
         annual_return = (1 + total_return) ** (252 / len(daily_returns)) - 1
-        annual_volatility = daily_returns.std() * np.sqrt(252)
+        annual_volatility = daily_returns.std(ddof=1) * np.sqrt(252)
         sharpe_ratio = annual_return / annual_volatility if annual_volatility > 0 else 0
         
-        # Calculate drawdowns
-        cumulative_returns = (1 + daily_returns).cumprod()
-        running_max = cumulative_returns.cummax()
-        drawdowns = (cumulative_returns / running_max) - 1
-        max_drawdown = drawdowns.min()
+        # Calculate drawdowns directly on the portfolio values
+        max_drawdown = calculate_drawdowns(pv).min()
         
         # Calculate additional metrics
-        win_rate = (daily_returns > 0).mean()
-        profit_loss_ratio = abs(daily_returns[daily_returns > 0].mean() / daily_returns[daily_returns < 0].mean()) if len(daily_returns[daily_returns < 0]) > 0 else float('inf')
+        gains = daily_returns[daily_returns > 0]
+        losses = daily_returns[daily_returns < 0]
+        win_rate = len(gains) / len(daily_returns)
+        profit_loss_ratio = abs(gains.mean() / losses.mean()) if len(losses) > 0 else float('inf')
         
         metrics = {
             'total_return': total_return,
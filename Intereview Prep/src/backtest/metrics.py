@@ -2,6 +2,47 @@ import pandas as pd
 import numpy as np
 from scipy import stats
 
+from src.jit import njit
+
+
+@njit(cache=True)
+def _drawdowns_nb(values):
+    """
+    Drawdown from the running peak in one pass, without a running-max array.
+    
+    NaN values are skipped when tracking the peak, like ``np.fmax.accumulate``.
+    """
+    n = values.shape[0]
+    out = np.empty(n)
+    peak = np.nan
+    
+    for i in range(n):
+        value = values[i]
+        if value > peak or peak != peak:
+            peak = value
+        out[i] = value / peak - 1.0
+    
+    return out
+
+
+def calculate_drawdowns(values):
+    """
+    Calculate drawdowns from a series of portfolio (or cumulative return) values.
+    
+    Parameters:
+    -----------
+    values : numpy.ndarray
+        1-D array of portfolio values.
+        
+    Returns:
+    --------
+    numpy.ndarray
+        Array with the drawdown from the running peak at each point (0 at a peak).
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    return _drawdowns_nb(values)
+
+
 class PerformanceMetrics:
     """
     Calculate various performance metrics for factor evaluation.
@@ -17,6 +58,19 @@ class PerformanceMetrics:
             Multi-index DataFrame with ticker and date indices and OHLCV data.
         """
         self.price_data = price_data
+        self._close_prices = None
+        
+    @property
+    def close_prices(self):
+        """
+        Closing prices with dates as rows and tickers as columns.
+        
+        The unstacked matrix is built on first access and shared by all
+        metric calculations.
+        """
+        if self._close_prices is None:
+            self._close_prices = self.price_data['Close'].unstack('Ticker')
+        return self._close_prices
         
     def calculate_factor_returns(self, factor_data, n_quantiles=5, holdings_period=20):
         """
@@ -37,7 +91,7 @@ class PerformanceMetrics:
             DataFrame with returns for each quantile portfolio.
         """
         # Get closing prices
-        close_prices = self.price_data['Close'].unstack('Ticker')
+        close_prices = self.close_prices
         
         # Calculate forward returns
         forward_returns = close_prices.pct_change(holdings_period).shift(-holdings_period)
@@ -85,37 +139,88 @@ class PerformanceMetrics:
         pandas.Series
             Series with IC values for each date.
         """
-        # Get closing prices
-        close_prices = self.price_data['Close'].unstack('Ticker')
+        # Calculate forward returns aligned with the factor data
+        forward_returns = self._forward_returns(factor_data, [forward_period])
         
-        # Calculate forward returns
-        forward_returns = close_prices.pct_change(forward_period).shift(-forward_period)
+        # Calculate IC for each date
+        ic = self._rank_ic(factor_data.to_numpy(dtype=np.float64), forward_returns)[0]
+        ic_series = pd.Series(ic, index=factor_data.index)
         
-        # Initialize IC series
-        ic_series = pd.Series(index=factor_data.index)
+        return ic_series.dropna()
+    
+    def _forward_returns(self, factor_data, periods):
+        """
+        Calculate forward returns for several horizons in a single pass.
         
-        # Calculate IC for each date
-        for date in factor_data.index:
-            if date not in forward_returns.index:
-                continue
-                
-            # Get factor values and forward returns for current date
-            current_factors = factor_data.loc[date].dropna()
-            current_returns = forward_returns.loc[date, current_factors.index].dropna()
+        Parameters:
+        -----------
+        factor_data : pandas.DataFrame
+            DataFrame with factor values for each ticker and date.
+        periods : list of int
+            Forward return horizons in days.
             
-            # Align data
-            common_stocks = current_factors.index.intersection(current_returns.index)
-            if len(common_stocks) < 10:  # Require at least 10 stocks for meaningful correlation
-                continue
-                
-            # Calculate rank correlation (Spearman's)
-            factor_ranks = current_factors[common_stocks].rank()
-            return_ranks = current_returns[common_stocks].rank()
-            ic = factor_ranks.corr(return_ranks, method='spearman')
+        Returns:
+        --------
+        numpy.ndarray
+            Array of shape (len(periods), dates, tickers) aligned with factor_data.
+            Dates or tickers without price data are NaN.
+        """
+        # Get closing prices
+        close_prices = self.close_prices
+        prices = close_prices.reindex(columns=factor_data.columns).to_numpy(dtype=np.float64)
+        
+        # Forward return from date t to t + period for every horizon
+        forward_returns = np.full((len(periods),) + prices.shape, np.nan)
+        for h, period in enumerate(periods):
+            forward_returns[h, :-period] = prices[period:] / prices[:-period] - 1
+        
+        # Select the rows matching the factor dates
+        rows = close_prices.index.get_indexer(factor_data.index)
+        aligned = forward_returns[:, rows]
+        aligned[:, rows < 0] = np.nan
+        
+        return aligned
+    
+    def _rank_ic(self, factor_values, targets, min_stocks=10):
+        """
+        Calculate rank correlations for every date and target at once.
+        
+        Parameters:
+        -----------
+        factor_values : numpy.ndarray
+            Array of shape (dates, tickers) with factor values.
+        targets : numpy.ndarray
+            Array of shape (targets, dates, tickers), e.g. forward returns for
+            several horizons or several risk factors.
+        min_stocks : int, optional
+            Minimum number of stocks required for a meaningful correlation.
             
-            ic_series[date] = ic
+        Returns:
+        --------
+        numpy.ndarray
+            Array of shape (targets, dates) with Spearman correlations, NaN where undefined.
+        """
+        n_targets, n_dates, n_stocks = targets.shape
         
-        return ic_series.dropna()
+        # Only stocks with both a factor value and a target value are ranked
+        factors = np.broadcast_to(factor_values, targets.shape)
+        valid = ~np.isnan(factors) & ~np.isnan(targets)
+        
+        factor_ranks = pd.DataFrame(np.where(valid, factors, np.nan).reshape(-1, n_stocks)).rank(axis=1).to_numpy()
+        target_ranks = pd.DataFrame(np.where(valid, targets, np.nan).reshape(-1, n_stocks)).rank(axis=1).to_numpy()
+        count = valid.reshape(-1, n_stocks).sum(axis=1)
+        
+        # Pearson correlation of the ranks (Spearman's rho)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            factor_dev = factor_ranks - (np.nansum(factor_ranks, axis=1) / count)[:, None]
+            target_dev = target_ranks - (np.nansum(target_ranks, axis=1) / count)[:, None]
+            cov = np.nansum(factor_dev * target_dev, axis=1)
+            var = np.nansum(factor_dev ** 2, axis=1) * np.nansum(target_dev ** 2, axis=1)
+            ic = cov / np.sqrt(var)
+        
+        ic[count < min_stocks] = np.nan
+        
+        return ic.reshape(n_targets, n_dates)
     
     def calculate_factor_decay(self, factor_data, max_periods=60, step=5):
         """
@@ -139,9 +244,12 @@ class PerformanceMetrics:
         periods = range(step, max_periods + step, step)
         decay_df = pd.DataFrame(index=periods, columns=['IC_Mean', 'IC_Std', 'IC_t_stat', 'p_value'])
         
-        # Calculate IC for different forward periods
-        for period in periods:
-            ic_series = self.calculate_information_coefficient(factor_data, forward_period=period)
+        # Calculate IC for all forward periods in one batch
+        forward_returns = self._forward_returns(factor_data, list(periods))
+        ic_matrix = self._rank_ic(factor_data.to_numpy(dtype=np.float64), forward_returns)
+        
+        for period, ic in zip(periods, ic_matrix):
+            ic_series = pd.Series(ic).dropna()
             
             # Calculate statistics
             ic_mean = ic_series.mean()
@@ -169,28 +277,17 @@ class PerformanceMetrics:
         pandas.DataFrame
             DataFrame with factor exposures to risk factors.
         """
-        # Initialize DataFrame for exposures
-        exposures = pd.DataFrame(index=factor_data.index, 
-                                columns=risk_factors.columns)
+        # Align every risk factor with the factor data: (risk factors, dates, tickers)
+        risk_values = np.stack([
+            risk_factors[risk_factor].unstack()
+            .reindex(index=factor_data.index, columns=factor_data.columns)
+            .to_numpy(dtype=np.float64)
+            for risk_factor in risk_factors.columns
+        ])
         
-        # Calculate exposures for each date
-        for date in factor_data.index:
-            if date not in risk_factors.index:
-                continue
-                
-            # Get factor values and risk factors for current date
-            current_factors = factor_data.loc[date].dropna()
-            current_risks = risk_factors.loc[date]
-            
-            # Align data
-            common_stocks = current_factors.index.intersection(current_risks.index)
-            if len(common_stocks) < 10:
-                continue
-                
-            # Calculate rank correlations with each risk factor
-            for risk_factor in current_risks.columns:
-                exposure = current_factors[common_stocks].corr(
-                    current_risks.loc[common_stocks, risk_factor], method='spearman')
-                exposures.loc[date, risk_factor] = exposure
+        # Calculate rank correlations with all risk factors for all dates at once
+        exposure_values = self._rank_ic(factor_data.to_numpy(dtype=np.float64), risk_values)
+        exposures = pd.DataFrame(exposure_values.T, index=factor_data.index,
+                                 columns=risk_factors.columns)
         
         return exposures.dropna() 
\ No newline at end of file
@@ -1,7 +1,15 @@
+import os
+from urllib.parse import unquote
+
 import pandas as pd
 import numpy as np
 import yfinance as yf
+import requests
+import lxml.html
+import pyarrow as pa
+import pyarrow.parquet as pq
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 
 class DataLoader:
     """
@@ -21,23 +29,49 @@ class DataLoader:
         self.start_date = config.get('start_date', '2018-01-01')
         self.end_date = config.get('end_date', datetime.now().strftime('%Y-%m-%d'))
         self.data_dir = config.get('data_dir', 'data/')
+        self.download_batch_size = config.get('download_batch_size', 20)
+        self._sp500_tickers = None
         
     def get_sp500_tickers(self):
         """
         Get the current list of S&P 500 tickers.
         
+        The list is memoized on the instance and cached on disk for the
+        current day, so repeated calls do not re-scrape the constituents page.
+        
         Returns:
         --------
         list
             List of S&P 500 ticker symbols.
         """
+        if self._sp500_tickers is not None:
+            return list(self._sp500_tickers)
+        
+        cache_file = f"{self.data_dir}/raw/sp500_tickers_{datetime.now().strftime('%Y-%m-%d')}.pkl"
+        
+        # Check if today's cached list exists
+        try:
+            self._sp500_tickers = pd.read_pickle(cache_file)
+            return list(self._sp500_tickers)
+        except FileNotFoundError:
+            pass
+        
         # For a complete implementation, use a proper source for S&P 500 constituents
         # This is a simplified version that can be enhanced
         sp500_url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
-        tables = pd.read_html(sp500_url)
-        sp500_table = tables[0]
-        tickers = sp500_table['Symbol'].tolist()
-        return tickers
+        response = requests.get(sp500_url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=10)
+        response.raise_for_status()
+        
+        # Only the symbol column of the constituents table is needed
+        doc = lxml.html.fromstring(response.content)
+        symbols = doc.xpath("//table[@id='constituents']//tr/td[1]/a/text()")
+        tickers = [symbol.strip() for symbol in symbols]
+        
+        # Save to cache
+        pd.to_pickle(tickers, cache_file)
+        self._sp500_tickers = tickers
+        
+        return list(tickers)
     
     def load_price_data(self, tickers=None, force_download=False):
         """
@@ -57,41 +91,137 @@ class DataLoader:
         """
         if tickers is None:
             tickers = self.get_sp500_tickers()
+        tickers = list(tickers)
         
-        cache_file = f"{self.data_dir}/raw/price_data_{self.start_date}_{self.end_date}.pkl"
+        # Prices are cached in a Parquet dataset partitioned by ticker
+        cache_dir = f"{self.data_dir}/raw/price_data_{self.start_date}_{self.end_date}"
         
-        # Check if cached data exists
-        try:
-            if not force_download:
-                return pd.read_pickle(cache_file)
-        except FileNotFoundError:
-            pass
+        # Only download tickers that are not cached yet
+        if force_download:
+            missing_tickers = tickers
+        else:
+            cached_tickers = self._cached_price_tickers(cache_dir)
+            missing_tickers = [ticker for ticker in tickers if ticker not in cached_tickers]
         
-        # Download data for each ticker
-        all_data = []
-        for ticker in tickers:
+        # Download data in batches of tickers per request
+        for i in range(0, len(missing_tickers), self.download_batch_size):
+            batch = missing_tickers[i:i + self.download_batch_size]
             try:
-                print(f"Downloading data for {ticker}...")
-                ticker_data = yf.download(ticker, start=self.start_date, end=self.end_date)
-                ticker_data = ticker_data.droplevel(1, axis=1)
-                ticker_data['Ticker'] = ticker
-                all_data.append(ticker_data)
+                batch_data = self._download_batch(batch)
             except Exception as e:
-                print(f"Error downloading data for {ticker}: {e}")
+                print(f"Error downloading data for {', '.join(batch)}: {e}")
+                continue
+            
+            # Save each batch to the cache as soon as it arrives, so a failed
+            # run only has to download the remaining tickers next time
+            if batch_data:
+                self._save_price_batch(cache_dir, batch_data)
+        
+        cached_tickers = self._cached_price_tickers(cache_dir)
+        available_tickers = [ticker for ticker in tickers if ticker in cached_tickers]
         
         # Combine all data into a multi-index DataFrame
-        if not all_data:
+        if not available_tickers:
             raise ValueError("No data was downloaded. Please check your internet connection and ticker list.")
         
-        combined_data = pd.concat(all_data)
-        combined_data = combined_data.reset_index()
-        combined_data = combined_data.set_index(['Ticker', 'Date'])
-        
-        # Save to cache
-        combined_data.to_pickle(cache_file)
+        combined_data = pd.read_parquet(cache_dir, engine='pyarrow',
+                                        filters=[('Ticker', 'in', available_tickers)])
+        combined_data['Ticker'] = combined_data['Ticker'].astype(str)
+        combined_data = combined_data.set_index(['Ticker', 'Date']).sort_index()
         
         return combined_data
     
+    def _cached_price_tickers(self, cache_dir):
+        """
+        List the tickers that already have a partition in the price cache.
+        
+        Parameters:
+        -----------
+        cache_dir : str
+            Root directory of the partitioned Parquet dataset.
+            
+        Returns:
+        --------
+        set
+            Ticker symbols with cached price data.
+        """
+        if not os.path.isdir(cache_dir):
+            return set()
+        
+        return {unquote(entry[len('Ticker='):]) for entry in os.listdir(cache_dir)
+                if entry.startswith('Ticker=')}
+    
+    def _save_price_batch(self, cache_dir, batch_data):
+        """
+        Write a batch of downloaded prices to the partitioned price cache.
+        
+        Parameters:
+        -----------
+        cache_dir : str
+            Root directory of the partitioned Parquet dataset.
+        batch_data : dict
+            Date-indexed OHLCV DataFrames keyed by ticker.
+        """
+        batch_frame = pd.concat(batch_data, names=['Ticker', 'Date']).astype(np.float64).reset_index()
+        table = pa.Table.from_pandas(batch_frame, preserve_index=False)
+        
+        # Replace any existing files of the written tickers, e.g. on force_download
+        pq.write_to_dataset(table, root_path=cache_dir, partition_cols=['Ticker'],
+                            compression='zstd', existing_data_behavior='delete_matching')
+    
+    def _download_batch(self, tickers):
+        """
+        Download price data for a batch of tickers in a single request.
+        
+        yfinance fetches the tickers of a batch on its own worker threads.
+        Batches are downloaded one after another because concurrent
+        yf.download calls share yfinance's module-level result cache.
+        
+        Parameters:
+        -----------
+        tickers : list
+            Ticker symbols to download.
+            
+        Returns:
+        --------
+        dict
+            Date-indexed OHLCV DataFrames keyed by ticker, for each ticker
+            that returned data.
+        """
+        print(f"Downloading data for {', '.join(tickers)}...")
+        batch_data = yf.download(" ".join(tickers), start=self.start_date, end=self.end_date,
+                                 group_by='ticker', threads=True, progress=False)
+        
+        all_data = {}
+        for ticker in tickers:
+            if ticker not in batch_data.columns.get_level_values(0):
+                print(f"Error downloading data for {ticker}: no data returned")
+                continue
+            ticker_data = batch_data[ticker].dropna(how='all')
+            if ticker_data.empty:
+                print(f"Error downloading data for {ticker}: no data returned")
+                continue
+            all_data[ticker] = ticker_data
+        
+        return all_data
+    
+    def _fetch_fundamentals(self, ticker):
+        """
+        Fetch the financial statements for a single ticker.
+        
+        Parameters:
+        -----------
+        ticker : str
+            Ticker symbol to fetch.
+            
+        Returns:
+        --------
+        tuple
+            (ticker, income statement, balance sheet, cash flow statement).
+        """
+        ticker_obj = yf.Ticker(ticker)
+        return ticker, ticker_obj.income_stmt, ticker_obj.balance_sheet, ticker_obj.cashflow
+    
     def load_fundamental_data(self, tickers=None):
         """
         Load fundamental data for the specified tickers.
@@ -116,37 +246,37 @@ class DataLoader:
         # Create a dictionary to store fundamental data
         fundamental_data = {}
         
-        for ticker in tickers[:10]:  # Limiting to 10 tickers for demonstration
-            try:
-                # Get ticker information
-                ticker_obj = yf.Ticker(ticker)
-                
-                # Get financial data
-                income_stmt = ticker_obj.income_stmt
-                balance_sheet = ticker_obj.balance_sheet
-                cash_flow = ticker_obj.cashflow
-                
-                # Extract key metrics
-                if not income_stmt.empty and not balance_sheet.empty:
-                    # Calculate fundamental ratios
-                    try:
-                        net_income = income_stmt.loc['Net Income']
-                        total_assets = balance_sheet.loc['Total Assets']
-                        total_equity = balance_sheet.loc['Total Stockholder Equity']
-                        
-                        # Calculate ROA and ROE
-                        roa = net_income / total_assets
-                        roe = net_income / total_equity
-                        
-                        fundamental_data[ticker] = {
-                            'ROA': roa,
-                            'ROE': roe,
-                            # Add more fundamental metrics as needed
-                        }
-                    except (KeyError, TypeError) as e:
-                        print(f"Error processing fundamental data for {ticker}: {e}")
-            except Exception as e:
-                print(f"Error fetching fundamental data for {ticker}: {e}")
+        # Each statement attribute is a separate HTTP request, so fetch the
+        # tickers concurrently and process the results in submission order
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            futures = [(ticker, executor.submit(self._fetch_fundamentals, ticker))
+                       for ticker in tickers]
+            
+            for ticker, future in futures:
+                try:
+                    _, income_stmt, balance_sheet, cash_flow = future.result()
+                    
+                    # Extract key metrics
+                    if not income_stmt.empty and not balance_sheet.empty:
+                        # Calculate fundamental ratios
+                        try:
+                            net_income = income_stmt.loc['Net Income']
+                            total_assets = balance_sheet.loc['Total Assets']
+                            total_equity = balance_sheet.loc['Total Stockholder Equity']
+                            
+                            # Calculate ROA and ROE
+                            roa = net_income / total_assets
+                            roe = net_income / total_equity
+                            
+                            fundamental_data[ticker] = {
+                                'ROA': roa,
+                                'ROE': roe,
+                                # Add more fundamental metrics as needed
+                            }
+                        except (KeyError, TypeError) as e:
+                            print(f"Error processing fundamental data for {ticker}: {e}")
+                except Exception as e:
+                    print(f"Error fetching fundamental data for {ticker}: {e}")
         
         # Convert to DataFrame
         fundamental_df = pd.DataFrame.from_dict(fundamental_data, orient='index')
@@ -1,6 +1,53 @@
 import pandas as pd
 import numpy as np
 
+from src.factors.standardize import cross_sectional_zscore
+from src.jit import njit, prange
+
+
+@njit(parallel=True, cache=True, error_model='numpy')
+def _wilder_rsi_nb(prices, window):
+    """
+    RSI of each column of a [dates, tickers] price matrix using Wilder's smoothing.
+    
+    Matches pandas ``ewm(alpha=1/window, adjust=False, min_periods=window).mean()``
+    applied to the clipped up and down price moves, including its NaN handling.
+    """
+    n_dates, n_tickers = prices.shape
+    alpha = 1.0 / window
+    out = np.full((n_dates, n_tickers), np.nan)
+    
+    for j in prange(n_tickers):
+        avg_up = np.nan
+        avg_down = np.nan
+        old_wt = 1.0
+        nobs = 0
+        
+        for i in range(1, n_dates):
+            delta = prices[i, j] - prices[i - 1, j]
+            is_observation = delta == delta
+            if is_observation:
+                nobs += 1
+                up = max(delta, 0.0)
+                down = max(-delta, 0.0)
+            
+            if avg_up == avg_up:
+                old_wt *= 1.0 - alpha
+                if is_observation:
+                    if avg_up != up:
+                        avg_up = (old_wt * avg_up + alpha * up) / (old_wt + alpha)
+                    if avg_down != down:
+                        avg_down = (old_wt * avg_down + alpha * down) / (old_wt + alpha)
+                    old_wt = 1.0
+            elif is_observation:
+                avg_up = up
+                avg_down = down
+            
+            if nobs >= window:
+                out[i, j] = 100.0 - 100.0 / (1.0 + avg_up / avg_down)
+    
+    return out
+
 class MomentumFactors:
     """
     Implements various momentum-based factors.
@@ -16,10 +63,23 @@ class MomentumFactors:
             Multi-index DataFrame with ticker and date indices and OHLCV data.
         """
         self.price_data = price_data
+        self._close_prices = None
         
-    def calculate_price_momentum(self, lookback_months=12, skip_months=1):
+    @property
+    def close_prices(self):
         """
-        Calculate price momentum over a lookback period, excluding the most recent months.
+        Closing prices with dates as rows and tickers as columns.
+        
+        The unstacked matrix is built on first access and shared by all
+        factor calculations.
+        """
+        if self._close_prices is None:
+            self._close_prices = self.price_data['Close'].unstack('Ticker')
+        return self._close_prices
+        
+    def _momentum_returns(self, lookback_months=12, skip_months=1):
+        """
+        Calculate raw momentum returns over a lookback period, excluding the most recent months.
         
         Parameters:
         -----------
@@ -31,51 +91,64 @@ class MomentumFactors:
         Returns:
         --------
         pandas.DataFrame
-            DataFrame with price momentum values for each ticker and date.
+            DataFrame with momentum returns for each ticker and date.
         """
         # Get closing prices
-        close_prices = self.price_data['Close'].unstack('Ticker')
+        close_prices = self.close_prices
         
         # Convert to monthly prices for cleaner month-to-month calculations
         monthly_prices = close_prices.resample('ME').last()
         
-        # Initialize a DataFrame to store momentum returns
-        momentum_df = pd.DataFrame(index=close_prices.index, columns=close_prices.columns)
+        # Momentum as of each month-end: return from the lookback month-end
+        # to the skip month-end
+        monthly_momentum = (
+            monthly_prices.shift(skip_months) / monthly_prices.shift(lookback_months) - 1
+        )
+        if skip_months >= lookback_months:
+            # No valid window between the two month-ends
+            monthly_momentum[:] = np.nan
         
-        # Calculate the momentum for each date in the original price series
-        for date in close_prices.index:
-            # Find the most recent month-end before this date
-            month_end = pd.Timestamp(date.year, date.month, 1) - pd.Timedelta(days=1)
-            
-            # Skip back the required number of months
-            skip_month = month_end - pd.DateOffset(months=skip_months)
-            lookback_month = month_end - pd.DateOffset(months=lookback_months)
-            
-            # Find the closest available dates in our monthly data
-            try:
-                # Find nearest available dates
-                skip_date = monthly_prices.index[monthly_prices.index <= skip_month][-1]
-                lookback_date = monthly_prices.index[monthly_prices.index <= lookback_month][-1]
-                
-                # Calculate momentum returns
-                if skip_date > lookback_date:  # Ensure we have enough history
-                    momentum_returns = monthly_prices.loc[skip_date] / monthly_prices.loc[lookback_date] - 1
-                    momentum_df.loc[date] = momentum_returns
-            except (IndexError, KeyError):
-                # Not enough history
-                pass
+        # Each date uses the momentum as of the most recent month-end strictly
+        # before it; find that month-end's row for every date in one lookup
+        month_ends = monthly_prices.index.to_numpy().astype('datetime64[M]')
+        date_months = close_prices.index.to_numpy().astype('datetime64[M]')
+        month_pos = np.searchsorted(month_ends, date_months, side='left') - 1
+        
+        momentum_values = monthly_momentum.to_numpy()[np.maximum(month_pos, 0)]
+        momentum_values[month_pos < 0] = np.nan
+        momentum_df = pd.DataFrame(momentum_values, index=close_prices.index, columns=close_prices.columns)
         
         # Drop rows with all NaNs (dates with insufficient history)
         momentum_df = momentum_df.dropna(how='all')
         
+        return momentum_df
+    
+    def calculate_price_momentum(self, lookback_months=12, skip_months=1):
+        """
+        Calculate price momentum over a lookback period, excluding the most recent months.
+        
+        Parameters:
+        -----------
+        lookback_months : int, optional
+            Total lookback period in months (default 12).
+        skip_months : int, optional
+            Number of most recent months to exclude (default 1).
+            
+        Returns:
+        --------
+        pandas.DataFrame
+            DataFrame with price momentum values for each ticker and date.
+        """
+        momentum_df = self._momentum_returns(lookback_months, skip_months)
+        
         # Rank stocks cross-sectionally for each date
         momentum_factor = momentum_df.rank(axis=1, pct=True)
         
         return momentum_factor
     
-    def calculate_relative_strength_index(self, window=14):
+    def _relative_strength_index(self, window=14):
         """
-        Calculate Relative Strength Index (RSI) momentum factor.
+        Calculate raw Relative Strength Index (RSI) values using Wilder's smoothing.
         
         Parameters:
         -----------
@@ -88,35 +161,38 @@ class MomentumFactors:
             DataFrame with RSI values for each ticker and date.
         """
         # Get closing prices
-        close_prices = self.price_data['Close'].unstack('Ticker')
-        
-        # Calculate daily returns
-        daily_returns = close_prices.pct_change()
+        close_prices = self.close_prices
         
-        # Separate upward and downward movements
-        up_returns = daily_returns.copy()
-        down_returns = daily_returns.copy()
+        # Wilder-smoothed RSI computed column by column in a compiled kernel
+        rsi_values = _wilder_rsi_nb(close_prices.to_numpy(dtype=np.float64), window)
+        rsi = pd.DataFrame(rsi_values, index=close_prices.index, columns=close_prices.columns)
         
-        up_returns[up_returns < 0] = 0
-        down_returns[down_returns > 0] = 0
-        down_returns = down_returns.abs()
-        
-        # Calculate rolling averages of up and down movements
-        avg_up = up_returns.rolling(window=window).mean()
-        avg_down = down_returns.rolling(window=window).mean()
+        return rsi
+    
+    def calculate_relative_strength_index(self, window=14):
+        """
+        Calculate Relative Strength Index (RSI) momentum factor using Wilder's smoothing.
         
-        # Calculate RSI
-        rs = avg_up / avg_down
-        rsi = 100 - (100 / (1 + rs))
+        Parameters:
+        -----------
+        window : int, optional
+            Lookback window for RSI calculation.
+            
+        Returns:
+        --------
+        pandas.DataFrame
+            DataFrame with RSI values for each ticker and date.
+        """
+        rsi = self._relative_strength_index(window)
         
         # Rank stocks cross-sectionally
         rsi_factor = rsi.rank(axis=1, pct=True)
         
         return rsi_factor
     
-    def calculate_mean_reversion(self, window=20):
+    def _short_term_returns(self, window=20):
         """
-        Calculate mean reversion factor as a negative short-term momentum.
+        Calculate raw short-term returns used by the mean reversion factor.
         
         Parameters:
         -----------
@@ -126,14 +202,32 @@ class MomentumFactors:
         Returns:
         --------
         pandas.DataFrame
-            DataFrame with mean reversion values for each ticker and date.
+            DataFrame with short-term returns for each ticker and date.
         """
         # Get closing prices
-        close_prices = self.price_data['Close'].unstack('Ticker')
+        close_prices = self.close_prices
         
         # Calculate short-term returns
         short_returns = close_prices.pct_change(window)
         
+        return short_returns
+    
+    def calculate_mean_reversion(self, window=20):
+        """
+        Calculate mean reversion factor as a negative short-term momentum.
+        
+        Parameters:
+        -----------
+        window : int, optional
+            Lookback window for mean reversion calculation.
+            
+        Returns:
+        --------
+        pandas.DataFrame
+            DataFrame with mean reversion values for each ticker and date.
+        """
+        short_returns = self._short_term_returns(window)
+        
         # Mean reversion is the negative of short-term momentum
         mean_reversion_factor = -short_returns.rank(axis=1, pct=True)
         
@@ -143,6 +237,9 @@ class MomentumFactors:
         """
         Combine multiple momentum factors into a single composite factor.
         
+        Each raw signal is standardized cross-sectionally, and the weighted
+        sum is ranked once.
+        
         Parameters:
         -----------
         weights : dict, optional
@@ -160,15 +257,19 @@ class MomentumFactors:
                 'mean_reversion': 0.2
             }
         
-        price_momentum = self.calculate_price_momentum(lookback_months=12, skip_months=1)
-        rsi = self.calculate_relative_strength_index()
-        mean_reversion = self.calculate_mean_reversion()
+        momentum_returns = self._momentum_returns(lookback_months=12, skip_months=1)
+        rsi = self._relative_strength_index()
+        short_returns = self._short_term_returns()
         
-        # Combine factors using specified weights
-        combined_factor = (
-            weights['price_momentum'] * price_momentum +
-            weights['rsi'] * rsi +
-            weights['mean_reversion'] * mean_reversion
+        # Combine standardized signals using specified weights (mean reversion
+        # is the negative of short-term momentum)
+        combined_signal = (
+            weights['price_momentum'] * cross_sectional_zscore(momentum_returns) +
+            weights['rsi'] * cross_sectional_zscore(rsi) -
+            weights['mean_reversion'] * cross_sectional_zscore(short_returns)
         )
         
+        # Rank stocks cross-sectionally based on the combined signal
+        combined_factor = combined_signal.rank(axis=1, pct=True)
+        
         return combined_factor 
\ No newline at end of file
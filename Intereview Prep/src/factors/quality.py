@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 
+from src.factors.standardize import cross_sectional_zscore
+
 class QualityFactors:
     """
     Implements various quality-based factors.
@@ -20,45 +22,69 @@ class QualityFactors:
         self.price_data = price_data
         self.fundamental_data = fundamental_data
         
-    def calculate_return_on_equity(self):
+        # Tickers and dates shared by all simulated factors
+        self._tickers = price_data.index.get_level_values('Ticker').unique()
+        self._dates = price_data.index.get_level_values('Date').unique()
+        
+        # Simulated data is generated once per instance and reused
+        self._factor_cache = {}
+        
+        # Random generator for the simulated data
+        self._rng = np.random.default_rng()
+        
+    def _simulate_return_on_equity(self):
         """
-        Calculate Return on Equity (ROE) quality factor.
+        Simulate raw Return on Equity (ROE) values.
         
         Returns:
         --------
         pandas.DataFrame
             DataFrame with ROE values for each ticker and date.
         """
+        if 'return_on_equity' in self._factor_cache:
+            return self._factor_cache['return_on_equity']
+        
         # In a real implementation, you would extract ROE from fundamental data
         # This is a simplified version for demonstration
         
         # Get tickers
-        tickers = self.price_data.index.get_level_values('Ticker').unique()
-        dates = self.price_data.index.get_level_values('Date').unique()
+        tickers = self._tickers
+        dates = self._dates
         
-        # Create a DataFrame to store ROE values
-        roe_values = pd.DataFrame(index=dates, columns=tickers)
+        # Simulate ROE values for all tickers at once
+        # In reality, you would use actual ROE data
+        base_roe = self._rng.uniform(0.05, 0.30, size=len(tickers))  # Random baseline ROE between 5% and 30%
         
-        # Fill with simulated ROE values
-        for ticker in tickers:
-            # In reality, you would use actual ROE data
-            base_roe = np.random.uniform(0.05, 0.30)  # Random baseline ROE between 5% and 30%
-            
-            # Add some time variation to make it realistic
-            trend = np.linspace(-0.05, 0.05, len(dates))  # Slight trend
-            noise = np.random.normal(0, 0.02, len(dates))  # Small random variations
-            
-            roe_series = base_roe + trend + noise
-            roe_values[ticker] = roe_series
+        # Add some time variation to make it realistic
+        trend = np.linspace(-0.05, 0.05, len(dates))[:, None]  # Slight trend
+        noise = self._rng.normal(0, 0.02, (len(dates), len(tickers)))  # Small random variations
+        
+        roe = base_roe[None, :] + trend + noise
+        roe_values = pd.DataFrame(roe, index=dates, columns=tickers)
+        
+        self._factor_cache['return_on_equity'] = roe_values
+        
+        return roe_values
+    
+    def calculate_return_on_equity(self):
+        """
+        Calculate Return on Equity (ROE) quality factor.
+        
+        Returns:
+        --------
+        pandas.DataFrame
+            DataFrame with ROE values for each ticker and date.
+        """
+        roe_values = self._simulate_return_on_equity()
         
         # Rank stocks cross-sectionally based on ROE
         roe_factor = roe_values.rank(axis=1, pct=True)
         
         return roe_factor
     
-    def calculate_earnings_stability(self, window=8):
+    def _simulate_earnings_volatility(self, window=8):
         """
-        Calculate earnings stability factor based on earnings volatility.
+        Simulate raw earnings volatility values.
         
         Parameters:
         -----------
@@ -68,69 +94,101 @@ class QualityFactors:
         Returns:
         --------
         pandas.DataFrame
-            DataFrame with earnings stability values for each ticker and date.
+            DataFrame with earnings volatility values for each ticker and date.
         """
+        if ('earnings_volatility', window) in self._factor_cache:
+            return self._factor_cache[('earnings_volatility', window)]
+        
         # This would require quarterly earnings data
         # For demonstration, we'll simulate earnings data
         
         # Get tickers and dates
-        tickers = self.price_data.index.get_level_values('Ticker').unique()
-        dates = self.price_data.index.get_level_values('Date').unique()
+        tickers = self._tickers
+        dates = self._dates
         
-        # Create a DataFrame to store earnings volatility values
-        earnings_volatility = pd.DataFrame(index=dates, columns=tickers)
+        # Simulate earnings volatility for all tickers at once - lower is better for quality
+        base_volatility = self._rng.uniform(0.1, 0.5, size=len(tickers))
         
-        # Fill with simulated earnings volatility values
-        for ticker in tickers:
-            # Simulate earnings volatility - lower is better for quality
-            base_volatility = np.random.uniform(0.1, 0.5)
-            
-            # Add some time variation
-            trend = np.linspace(-0.05, 0.05, len(dates))
-            noise = np.random.normal(0, 0.05, len(dates))
-            
-            volatility_series = base_volatility + trend + noise
-            volatility_series = np.maximum(0.01, volatility_series)  # Ensure positive values
+        # Add some time variation
+        trend = np.linspace(-0.05, 0.05, len(dates))[:, None]
+        noise = self._rng.normal(0, 0.05, (len(dates), len(tickers)))
+        
+        volatility = base_volatility[None, :] + trend + noise
+        volatility = np.maximum(0.01, volatility)  # Ensure positive values
+        
+        earnings_volatility = pd.DataFrame(volatility, index=dates, columns=tickers)
+        
+        self._factor_cache[('earnings_volatility', window)] = earnings_volatility
+        
+        return earnings_volatility
+    
+    def calculate_earnings_stability(self, window=8):
+        """
+        Calculate earnings stability factor based on earnings volatility.
+        
+        Parameters:
+        -----------
+        window : int, optional
+            Number of quarters to consider for stability calculation.
             
-            earnings_volatility[ticker] = volatility_series
+        Returns:
+        --------
+        pandas.DataFrame
+            DataFrame with earnings stability values for each ticker and date.
+        """
+        earnings_volatility = self._simulate_earnings_volatility(window)
         
         # Rank stocks cross-sectionally based on earnings stability (negative of volatility)
         earnings_stability_factor = -earnings_volatility.rank(axis=1, pct=True)
         
         return earnings_stability_factor
     
-    def calculate_debt_to_equity(self):
+    def _simulate_debt_to_equity(self):
         """
-        Calculate Debt-to-Equity ratio quality factor.
+        Simulate raw Debt-to-Equity ratios.
         
         Returns:
         --------
         pandas.DataFrame
             DataFrame with D/E values for each ticker and date.
         """
+        if 'debt_to_equity' in self._factor_cache:
+            return self._factor_cache['debt_to_equity']
+        
         # In a real implementation, you would extract D/E from fundamental data
         # This is a simplified version for demonstration
         
         # Get tickers and dates
-        tickers = self.price_data.index.get_level_values('Ticker').unique()
-        dates = self.price_data.index.get_level_values('Date').unique()
+        tickers = self._tickers
+        dates = self._dates
         
-        # Create a DataFrame to store D/E values
-        de_values = pd.DataFrame(index=dates, columns=tickers)
+        # Simulate D/E values for all tickers at once
+        # In reality, you would use actual D/E data
+        base_de = self._rng.uniform(0.2, 2.0, size=len(tickers))  # Random baseline D/E
         
-        # Fill with simulated D/E values
-        for ticker in tickers:
-            # In reality, you would use actual D/E data
-            base_de = np.random.uniform(0.2, 2.0)  # Random baseline D/E
-            
-            # Add some time variation to make it realistic
-            trend = np.linspace(-0.1, 0.1, len(dates))
-            noise = np.random.normal(0, 0.05, len(dates))
-            
-            de_series = base_de + trend + noise
-            de_series = np.maximum(0, de_series)  # Ensure non-negative values
-            
-            de_values[ticker] = de_series
+        # Add some time variation to make it realistic
+        trend = np.linspace(-0.1, 0.1, len(dates))[:, None]
+        noise = self._rng.normal(0, 0.05, (len(dates), len(tickers)))
+        
+        de = base_de[None, :] + trend + noise
+        de = np.maximum(0, de)  # Ensure non-negative values
+        
+        de_values = pd.DataFrame(de, index=dates, columns=tickers)
+        
+        self._factor_cache['debt_to_equity'] = de_values
+        
+        return de_values
+    
+    def calculate_debt_to_equity(self):
+        """
+        Calculate Debt-to-Equity ratio quality factor.
+        
+        Returns:
+        --------
+        pandas.DataFrame
+            DataFrame with D/E values for each ticker and date.
+        """
+        de_values = self._simulate_debt_to_equity()
         
         # Rank stocks cross-sectionally based on D/E (negative since lower D/E is generally better)
         de_factor = -de_values.rank(axis=1, pct=True)
@@ -141,6 +199,9 @@ class QualityFactors:
         """
         Combine multiple quality factors into a single composite factor.
         
+        Each raw signal is standardized cross-sectionally, and the weighted
+        sum is ranked once.
+        
         Parameters:
         -----------
         weights : dict, optional
@@ -158,15 +219,19 @@ class QualityFactors:
                 'debt_to_equity': 0.2
             }
         
-        roe_factor = self.calculate_return_on_equity()
-        earnings_stability_factor = self.calculate_earnings_stability()
-        de_factor = self.calculate_debt_to_equity()
+        roe_values = self._simulate_return_on_equity()
+        earnings_volatility = self._simulate_earnings_volatility()
+        de_values = self._simulate_debt_to_equity()
         
-        # Combine factors using specified weights
-        combined_factor = (
-            weights['return_on_equity'] * roe_factor +
-            weights['earnings_stability'] * earnings_stability_factor +
-            weights['debt_to_equity'] * de_factor
+        # Combine standardized signals using specified weights (lower volatility
+        # and lower D/E are better)
+        combined_signal = (
+            weights['return_on_equity'] * cross_sectional_zscore(roe_values) -
+            weights['earnings_stability'] * cross_sectional_zscore(earnings_volatility) -
+            weights['debt_to_equity'] * cross_sectional_zscore(de_values)
         )
         
+        # Rank stocks cross-sectionally based on the combined signal
+        combined_factor = combined_signal.rank(axis=1, pct=True)
+        
         return combined_factor 
\ No newline at end of file
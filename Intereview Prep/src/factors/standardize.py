@@ -0,0 +1,18 @@
+def cross_sectional_zscore(factor_values):
+    """
+    Standardize factor values across tickers on each date.
+
+    Parameters:
+    -----------
+    factor_values : pandas.DataFrame
+        DataFrame with dates as rows and tickers as columns.
+
+    Returns:
+    --------
+    pandas.DataFrame
+        DataFrame with each row demeaned and scaled to unit standard deviation.
+    """
+    mean = factor_values.mean(axis=1)
+    std = factor_values.std(axis=1)
+
+    return factor_values.sub(mean, axis=0).div(std, axis=0)
@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 
+from src.factors.standardize import cross_sectional_zscore
+
 class ValueFactors:
     """
     Implements various value-based factors.
@@ -20,87 +22,151 @@ class ValueFactors:
         self.price_data = price_data
         self.fundamental_data = fundamental_data
         
-    def calculate_price_to_book(self):
+        self._close_prices = None
+        
+        # Simulated ratios are generated once per instance and reused
+        self._factor_cache = {}
+        
+        # Random generator for the simulated data
+        self._rng = np.random.default_rng()
+        
+    @property
+    def close_prices(self):
         """
-        Calculate Price-to-Book ratio factor.
+        Closing prices with dates as rows and tickers as columns.
+        
+        The unstacked matrix is built on first access and shared by all
+        factor calculations.
+        """
+        if self._close_prices is None:
+            self._close_prices = self.price_data['Close'].unstack('Ticker')
+        return self._close_prices
+        
+    def _simulate_price_to_book(self):
+        """
+        Simulate raw Price-to-Book ratios.
         
         Returns:
         --------
         pandas.DataFrame
             DataFrame with P/B values for each ticker and date.
         """
+        if 'price_to_book' in self._factor_cache:
+            return self._factor_cache['price_to_book']
+        
         # In a real implementation, you would extract book value per share
         # from the fundamental data and calculate P/B ratio
         # This is a simplified version
         
         # Get closing prices
-        close_prices = self.price_data['Close'].unstack('Ticker')
+        close_prices = self.close_prices
         
         # Create a dummy P/B ratio for demonstration
         # In practice, you would calculate this using actual book values
-        pb_ratios = close_prices.copy()
+        # This is just simulating the effect with one random book value per ticker
+        book_value = self._rng.uniform(10, 100, size=len(close_prices.columns))
+        pb_ratios = pd.DataFrame(close_prices.to_numpy() / book_value[None, :],
+                                 index=close_prices.index, columns=close_prices.columns)
+        
+        self._factor_cache['price_to_book'] = pb_ratios
+        
+        return pb_ratios
+    
+    def calculate_price_to_book(self):
+        """
+        Calculate Price-to-Book ratio factor.
         
-        # Simulate P/B ratio calculation (random values for demonstration)
-        for ticker in pb_ratios.columns:
-            # In reality, you would use actual book values here
-            # This is just simulating the effect with random numbers
-            book_value = np.random.uniform(10, 100)
-            pb_ratios[ticker] = close_prices[ticker] / book_value
+        Returns:
+        --------
+        pandas.DataFrame
+            DataFrame with P/B values for each ticker and date.
+        """
+        pb_ratios = self._simulate_price_to_book()
         
         # Calculate the cross-sectional factor (negative since lower P/B typically means higher value)
         pb_factor = -pb_ratios.rank(axis=1, pct=True)
         
         return pb_factor
     
-    def calculate_price_to_earnings(self):
+    def _simulate_price_to_earnings(self):
         """
-        Calculate Price-to-Earnings ratio factor.
+        Simulate raw Price-to-Earnings ratios.
         
         Returns:
         --------
         pandas.DataFrame
             DataFrame with P/E values for each ticker and date.
         """
+        if 'price_to_earnings' in self._factor_cache:
+            return self._factor_cache['price_to_earnings']
+        
         # Get closing prices
-        close_prices = self.price_data['Close'].unstack('Ticker')
+        close_prices = self.close_prices
         
         # Create a dummy P/E ratio for demonstration
-        pe_ratios = close_prices.copy()
+        # In reality, you would use actual earnings here
+        earnings_per_share = self._rng.uniform(0.5, 10, size=len(close_prices.columns))
+        pe_ratios = pd.DataFrame(close_prices.to_numpy() / earnings_per_share[None, :],
+                                 index=close_prices.index, columns=close_prices.columns)
+        
+        self._factor_cache['price_to_earnings'] = pe_ratios
         
-        # Simulate P/E ratio calculation
-        for ticker in pe_ratios.columns:
-            # In reality, you would use actual earnings here
-            earnings_per_share = np.random.uniform(0.5, 10)
-            pe_ratios[ticker] = close_prices[ticker] / earnings_per_share
+        return pe_ratios
+    
+    def calculate_price_to_earnings(self):
+        """
+        Calculate Price-to-Earnings ratio factor.
+        
+        Returns:
+        --------
+        pandas.DataFrame
+            DataFrame with P/E values for each ticker and date.
+        """
+        pe_ratios = self._simulate_price_to_earnings()
         
         # Calculate the cross-sectional factor (negative since lower P/E typically means higher value)
         pe_factor = -pe_ratios.rank(axis=1, pct=True)
         
         return pe_factor
     
-    def calculate_ev_to_ebitda(self):
+    def _simulate_ev_to_ebitda(self):
         """
-        Calculate Enterprise Value to EBITDA ratio factor.
+        Simulate raw Enterprise Value to EBITDA ratios.
         
         Returns:
         --------
         pandas.DataFrame
             DataFrame with EV/EBITDA values for each ticker and date.
         """
+        if 'ev_to_ebitda' in self._factor_cache:
+            return self._factor_cache['ev_to_ebitda']
+        
         # This would require enterprise value and EBITDA data
         # For now, we'll create a placeholder similar to above
         # Get closing prices
-        close_prices = self.price_data['Close'].unstack('Ticker')
+        close_prices = self.close_prices
         
         # Create a dummy EV/EBITDA ratio
-        ev_ebitda_ratios = close_prices.copy()
+        # In reality, you would calculate this properly
+        ebitda = self._rng.uniform(1, 20, size=len(close_prices.columns))
+        ev_factor = self._rng.uniform(1.5, 3.0, size=len(close_prices.columns))  # Simulating enterprise value as a multiple of price
+        ev_ebitda_ratios = pd.DataFrame(close_prices.to_numpy() * (ev_factor / ebitda)[None, :],
+                                        index=close_prices.index, columns=close_prices.columns)
         
-        # Simulate EV/EBITDA calculation
-        for ticker in ev_ebitda_ratios.columns:
-            # In reality, you would calculate this properly
-            ebitda = np.random.uniform(1, 20)
-            ev_factor = np.random.uniform(1.5, 3.0)  # Simulating enterprise value as a multiple of price
-            ev_ebitda_ratios[ticker] = close_prices[ticker] * ev_factor / ebitda
+        self._factor_cache['ev_to_ebitda'] = ev_ebitda_ratios
+        
+        return ev_ebitda_ratios
+    
+    def calculate_ev_to_ebitda(self):
+        """
+        Calculate Enterprise Value to EBITDA ratio factor.
+        
+        Returns:
+        --------
+        pandas.DataFrame
+            DataFrame with EV/EBITDA values for each ticker and date.
+        """
+        ev_ebitda_ratios = self._simulate_ev_to_ebitda()
         
         # Calculate the cross-sectional factor (negative since lower EV/EBITDA typically means higher value)
         ev_ebitda_factor = -ev_ebitda_ratios.rank(axis=1, pct=True)
@@ -111,6 +177,9 @@ class ValueFactors:
         """
         Combine multiple value factors into a single composite factor.
         
+        Each raw ratio is standardized cross-sectionally, and the weighted
+        sum is ranked once.
+        
         Parameters:
         -----------
         weights : dict, optional
@@ -128,15 +197,19 @@ class ValueFactors:
                 'ev_to_ebitda': 0.2
             }
         
-        pb_factor = self.calculate_price_to_book()
-        pe_factor = self.calculate_price_to_earnings()
-        ev_ebitda_factor = self.calculate_ev_to_ebitda()
+        pb_ratios = self._simulate_price_to_book()
+        pe_ratios = self._simulate_price_to_earnings()
+        ev_ebitda_ratios = self._simulate_ev_to_ebitda()
         
-        # Combine factors using specified weights
-        combined_factor = (
-            weights['price_to_book'] * pb_factor +
-            weights['price_to_earnings'] * pe_factor +
-            weights['ev_to_ebitda'] * ev_ebitda_factor
+        # Combine standardized ratios using specified weights (negative since
+        # lower ratios typically mean higher value)
+        combined_signal = -(
+            weights['price_to_book'] * cross_sectional_zscore(pb_ratios) +
+            weights['price_to_earnings'] * cross_sectional_zscore(pe_ratios) +
+            weights['ev_to_ebitda'] * cross_sectional_zscore(ev_ebitda_ratios)
         )
         
+        # Rank stocks cross-sectionally based on the combined signal
+        combined_factor = combined_signal.rank(axis=1, pct=True)
+        
         return combined_factor 
\ No newline at end of file
@@ -0,0 +1,22 @@
+"""
+Optional Numba support for numeric kernels.
+
+If Numba is installed, ``njit`` and ``prange`` are the real Numba objects.
+Otherwise ``njit`` is a no-op and ``prange`` is ``range``, so decorated kernels
+still run as plain NumPy code.
+"""
+
+try:
+    from numba import njit, prange
+except ImportError:
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        
+        def decorator(func):
+            return func
+        
+        return decorator
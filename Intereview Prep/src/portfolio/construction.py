@@ -84,18 +84,27 @@ class PortfolioConstructor:
         pandas.Series
             Series with portfolio weights for each ticker.
         """
-        # Rank stocks based on factor values
-        ranks = factor_values.rank(method='first')
-        
         if self.market_neutral:
-            # Separate into longs and shorts
-            median_rank = ranks.median()
-            long_stocks = ranks[ranks > median_rank].index
-            short_stocks = ranks[ranks <= median_rank].index
+            # Separate into longs and shorts at the median without a full sort:
+            # the bottom half (rounded up) is short, the rest is long
+            values = factor_values.to_numpy()
+            n_short = len(values) - len(values) // 2
+            is_short = np.zeros(len(values), dtype=bool)
+            if n_short > 0:
+                threshold = values[np.argpartition(values, n_short - 1)[n_short - 1]]
+                is_short = values < threshold
+                
+                # Ties at the threshold go short in order of appearance
+                tied = np.flatnonzero(values == threshold)
+                is_short[tied[:n_short - is_short.sum()]] = True
+            
+            # Rank stocks within each half; long ranks continue after the shorts
+            long_ranks = factor_values[~is_short].rank(method='first') + n_short
+            short_ranks = factor_values[is_short].rank(method='first')
             
             # Calculate weights proportional to factor ranks
-            long_weights = ranks[long_stocks] / ranks[long_stocks].sum()
-            short_weights = -ranks[short_stocks] / ranks[short_stocks].sum()
+            long_weights = long_ranks / long_ranks.sum()
+            short_weights = -short_ranks / short_ranks.sum()
             
             # Normalize to ensure long weights sum to 1 and short weights sum to -1
             long_weights = long_weights / long_weights.sum()
@@ -104,7 +113,8 @@ class PortfolioConstructor:
             # Combine weights
             weights = pd.concat([long_weights, short_weights])
         else:
-            # Long-only portfolio
+            # Long-only portfolio with weights proportional to factor ranks
+            ranks = factor_values.rank(method='first')
             weights = ranks / ranks.sum()
         
         return weights
@@ -131,43 +141,40 @@ class PortfolioConstructor:
         factor_subset = factor_values[common_stocks]
         sector_subset = sectors[common_stocks]
         
-        # Initialize weights
-        weights = pd.Series(0.0, index=factor_subset.index)
+        if factor_subset.empty:
+            return pd.Series(0.0, index=factor_subset.index)
+        
+        # Rank stocks within their sectors
+        ranks = factor_subset.groupby(sector_subset).rank(method='first')
+        
+        # Equal sector allocation
+        sector_weight = 1.0 / sector_subset.nunique()
         
-        # Process each sector
-        for sector in sector_subset.unique():
-            sector_stocks = sector_subset[sector_subset == sector].index
-            sector_factors = factor_subset[sector_stocks]
+        if self.market_neutral:
+            # Split each sector into longs and shorts at its median rank
+            median_ranks = ranks.groupby(sector_subset).transform('median')
+            is_long = ranks > median_ranks
+            is_short = ~is_long
+            legs = [sector_subset, is_long]
             
-            if self.market_neutral:
-                # Split each sector into longs and shorts
-                sector_ranks = sector_factors.rank(method='first')
-                sector_median = sector_ranks.median()
-                
-                sector_long = sector_ranks[sector_ranks > sector_median].index
-                sector_short = sector_ranks[sector_ranks <= sector_median].index
-                
-                if len(sector_long) > 0 and len(sector_short) > 0:
-                    # Calculate weights within sector
-                    long_weights = sector_ranks[sector_long] / sector_ranks[sector_long].sum()
-                    short_weights = -sector_ranks[sector_short] / sector_ranks[sector_short].sum()
-                    
-                    # Normalize within sector
-                    long_weights = long_weights / long_weights.sum()
-                    short_weights = short_weights / abs(short_weights.sum()) * -1.0
-                    
-                    # Scale by sector weight (equal sector allocation)
-                    sector_weight = 1.0 / len(sector_subset.unique())
-                    weights[sector_long] = long_weights * sector_weight * 0.5
-                    weights[sector_short] = short_weights * sector_weight * 0.5
-            else:
-                # Long-only sector allocation
-                sector_ranks = sector_factors.rank(method='first')
-                sector_weights = sector_ranks / sector_ranks.sum()
-                
-                # Scale by sector weight (equal sector allocation)
-                sector_weight = 1.0 / len(sector_subset.unique())
-                weights[sector_stocks] = sector_weights * sector_weight
+            # Calculate weights within each sector leg
+            weights = ranks / ranks.groupby(legs).transform('sum')
+            weights[is_short] = -weights[is_short]
+            
+            # Normalize within sector
+            leg_sums = weights.groupby(legs).transform('sum')
+            weights[is_long] = weights[is_long] / leg_sums[is_long]
+            weights[is_short] = weights[is_short] / leg_sums[is_short].abs() * -1.0
+            
+            # Only sectors with both longs and shorts receive an allocation
+            n_long = is_long.groupby(sector_subset).transform('sum')
+            n_short = is_short.groupby(sector_subset).transform('sum')
+            has_both_legs = (n_long > 0) & (n_short > 0)
+            
+            weights = (weights * sector_weight * 0.5).where(has_both_legs, 0.0)
+        else:
+            # Long-only sector allocation
+            weights = ranks / ranks.groupby(sector_subset).transform('sum') * sector_weight
         
         return weights
     
@@ -185,34 +192,39 @@ class PortfolioConstructor:
         pandas.Series
             Series with adjusted portfolio weights.
         """
+        w = weights.to_numpy(dtype=np.float64, copy=True)
+        
         # Apply maximum position size limit
         if 'max_position' in self.position_limits:
             max_pos = self.position_limits['max_position']
-            weights[weights > max_pos] = max_pos
-            weights[weights < -max_pos] = -max_pos
+            np.clip(w, -max_pos, max_pos, out=w)
         
         # Normalize weights after applying limits
         if self.market_neutral:
             # Separate long and short positions
-            long_weights = weights[weights > 0]
-            short_weights = weights[weights < 0]
+            long_mask = w > 0
+            short_mask = w < 0
             
-            # If we have both long and short positions, normalize them
-            if len(long_weights) > 0 and len(short_weights) > 0:
+            # If we have both long and short positions, normalize them in place
+            if long_mask.any() and short_mask.any():
+                # Positions in neither leg are left at zero
+                w[~(long_mask | short_mask)] = 0.0
+                
                 # Scale long positions to sum to 1.0
-                long_weights = long_weights / long_weights.sum()
+                w[long_mask] /= w[long_mask].sum()
                 
                 # Scale short positions to sum to -1.0
-                short_weights = short_weights / abs(short_weights.sum()) * -1.0
-                
-                # Combine weights
-                weights = pd.concat([long_weights, short_weights])
+                w[short_mask] /= abs(w[short_mask].sum())
+                w[short_mask] *= -1.0
             else:
                 # If we only have long or short positions (edge case)
-                weights = weights / abs(weights.sum())
+                w /= abs(np.nansum(w))
         else:
             # Long-only normalization
-            if weights.sum() > 0:
-                weights = weights / weights.sum()
+            total = np.nansum(w)
+            if total > 0:
+                w /= total
+        
+        weights = pd.Series(w, index=weights.index)
         
         return weights 
\ No newline at end of file
@@ -1,8 +1,129 @@
+import os
+import sys
+from importlib import import_module
+
 import pandas as pd
 import numpy as np
 import cvxpy as cp
 from scipy.optimize import minimize
 
+from src.jit import njit
+
+try:
+    from cvxpygen import cpg
+except ImportError:
+    cpg = None
+
+
+@njit(cache=True, fastmath=True)
+def _risk_parity_objective(weights, cov, inv_n):
+    """
+    Squared deviation of each asset's risk contribution from an equal share.
+    
+    ``cov`` must be a contiguous float64 covariance matrix and ``inv_n`` is
+    1 / number of assets.
+    """
+    n = weights.shape[0]
+    cov_weights = np.empty(n)
+    variance = 0.0
+    for i in range(n):
+        total = 0.0
+        for j in range(n):
+            total += cov[i, j] * weights[j]
+        cov_weights[i] = total
+        variance += weights[i] * total
+    
+    portfolio_risk = np.sqrt(variance)
+    target = portfolio_risk * inv_n
+    
+    objective = 0.0
+    for i in range(n):
+        deviation = weights[i] * cov_weights[i] / portfolio_risk - target
+        objective += deviation * deviation
+    
+    return objective
+
+
+@njit(cache=True, fastmath=True)
+def _risk_parity_gradient(weights, cov, inv_n):
+    """
+    Analytic gradient of _risk_parity_objective with respect to the weights.
+    
+    With s = cov @ w, sigma = sqrt(w @ s), contributions c = w * s / sigma and
+    residuals r = c - sigma / n, the gradient is 2 * J.T @ r where
+    J = diag(s) / sigma + diag(w) @ cov / sigma - outer(c + sigma / n, s) / sigma**2.
+    """
+    n = weights.shape[0]
+    cov_weights = np.empty(n)
+    variance = 0.0
+    for i in range(n):
+        total = 0.0
+        for j in range(n):
+            total += cov[i, j] * weights[j]
+        cov_weights[i] = total
+        variance += weights[i] * total
+    
+    portfolio_risk = np.sqrt(variance)
+    target = portfolio_risk * inv_n
+    
+    residuals = np.empty(n)
+    scaled_residuals = np.empty(n)
+    outer_coef = 0.0
+    for i in range(n):
+        contribution = weights[i] * cov_weights[i] / portfolio_risk
+        residuals[i] = contribution - target
+        scaled_residuals[i] = residuals[i] * weights[i]
+        outer_coef += residuals[i] * (contribution + target)
+    outer_coef /= variance
+    
+    gradient = np.empty(n)
+    for k in range(n):
+        total = 0.0
+        for i in range(n):
+            total += cov[i, k] * scaled_residuals[i]
+        gradient[k] = 2.0 * ((residuals[k] * cov_weights[k] + total) / portfolio_risk
+                             - outer_coef * cov_weights[k])
+    
+    return gradient
+
+
+@njit(cache=True)
+def _risk_parity_ccd(cov, tol=1e-10, maxiter=500):
+    """
+    Long-only equal risk contribution weights by cyclical coordinate descent.
+    
+    Each coordinate update solves cov[i, i] * x_i**2 + c_i * x_i - 1 / n = 0
+    for its positive root, where c_i is the covariance of asset i with the
+    rest of the portfolio. The fixed point has x_i * (cov @ x)_i equal for all
+    assets, so the normalized x is the risk parity portfolio.
+    
+    Returns the normalized weights and whether the sweeps converged.
+    """
+    n = cov.shape[0]
+    budget = 1.0 / n
+    x = np.empty(n)
+    for i in range(n):
+        x[i] = 1.0 / np.sqrt(cov[i, i] * n)
+    
+    for _ in range(maxiter):
+        max_change = 0.0
+        for i in range(n):
+            a = cov[i, i]
+            c = 0.0
+            for j in range(n):
+                c += cov[i, j] * x[j]
+            c -= a * x[i]
+            
+            new_x = (-c + np.sqrt(c * c + 4.0 * a * budget)) / (2.0 * a)
+            max_change = max(max_change, abs(new_x - x[i]) / new_x)
+            x[i] = new_x
+        
+        if max_change < tol:
+            return x / x.sum(), True
+    
+    return x / x.sum(), False
+
+
 class PortfolioOptimizer:
     """
     Implements portfolio optimization techniques for factor-based strategies.
@@ -21,7 +142,19 @@ class PortfolioOptimizer:
         self.risk_aversion = config.get('risk_aversion', 1.0)
         self.method = config.get('optimization_method', 'mean_variance')
         
-    def optimize(self, expected_returns, risk_model, constraints=None):
+        # Parametrized CVXPY problems reused across calls, keyed by their structure
+        self._problems = {}
+        
+        # Problem keys with a registered CVXPYgen solver
+        self._generated_solvers = set()
+        
+        # Aligned inputs and covariance factor for the most recent covariance matrix
+        self._align_cache = {}
+        
+        # Sector membership matrix for the most recent sector data and assets
+        self._sector_cache = {}
+        
+    def optimize(self, expected_returns, risk_model, constraints=None, as_series=True):
         """
         Optimize portfolio weights based on expected returns and risk model.
         
@@ -33,25 +166,73 @@ class PortfolioOptimizer:
             Risk model (covariance matrix) or dict with risk factor exposures.
         constraints : dict, optional
             Dictionary with optimization constraints.
+        as_series : bool, optional
+            If False, return the raw weight array and its asset index instead
+            of building a Series.
             
         Returns:
         --------
-        pandas.Series
-            Series with optimized weights for each ticker.
+        pandas.Series or tuple
+            Series with optimized weights for each ticker, or
+            (numpy.ndarray of weights, pandas.Index of tickers) if as_series is False.
         """
         if self.method == 'mean_variance':
-            return self._mean_variance_optimization(expected_returns, risk_model, constraints)
+            weights, assets = self._mean_variance_optimization(expected_returns, risk_model, constraints)
         elif self.method == 'risk_parity':
-            return self._risk_parity_optimization(risk_model, constraints)
+            weights, assets = self._risk_parity_optimization(risk_model, constraints)
         elif self.method == 'max_sharpe':
-            return self._max_sharpe_optimization(expected_returns, risk_model, constraints)
+            weights, assets = self._max_sharpe_optimization(expected_returns, risk_model, constraints)
         else:
             raise ValueError(f"Unsupported optimization method: {self.method}")
+        
+        if not as_series:
+            return weights, assets
+        
+        return pd.Series(weights, index=assets)
+    
+    def optimize_many(self, expected_returns, risk_models, constraints=None):
+        """
+        Optimize portfolio weights for a sequence of rebalance dates.
+        
+        The problems are DPP, so every date with the same structure re-solves
+        one compiled problem with updated parameter values, warm-started from
+        the previous date's solution.
+        
+        Parameters:
+        -----------
+        expected_returns : pandas.DataFrame
+            DataFrame with dates as rows and tickers as columns.
+        risk_models : dict
+            Dictionary mapping each date to its covariance matrix.
+        constraints : dict, optional
+            Dictionary with optimization constraints, shared by all dates.
+            
+        Returns:
+        --------
+        pandas.DataFrame
+            DataFrame with dates as rows and optimized weights as columns.
+        """
+        dates = list(risk_models)
+        results = [self.optimize(expected_returns.loc[date].dropna(), risk_models[date], constraints, as_series=False)
+                   for date in dates]
+        
+        # Stack the raw arrays directly when every date has the same assets
+        if results and all(assets.equals(results[0][1]) for _, assets in results):
+            return pd.DataFrame(np.vstack([weights for weights, _ in results]), index=dates, columns=results[0][1])
+        
+        weights = {date: pd.Series(w, index=assets) for date, (w, assets) in zip(dates, results)}
+        
+        return pd.DataFrame.from_dict(weights, orient='index')
     
     def _mean_variance_optimization(self, expected_returns, cov_matrix, constraints=None):
         """
         Perform mean-variance optimization using CVXPY.
         
+        The problem is built once per constraint structure with CVXPY
+        Parameters, so repeated calls only update parameter values and re-solve
+        with OSQP warm-started from the previous solution. If generate_solver
+        has been called for the structure, the generated C solver is used.
+        
         Parameters:
         -----------
         expected_returns : pandas.Series
@@ -63,82 +244,432 @@ class PortfolioOptimizer:
             
         Returns:
         --------
-        pandas.Series
-            Series with optimized weights.
+        tuple
+            (numpy.ndarray of optimized weights, pandas.Index of tickers)
         """
         # Align data
+        common_assets, returns, cov, cov_factor = self._align_inputs(expected_returns, cov_matrix)
+        
+        key, limits = self._mean_variance_structure(common_assets, constraints)
+        
+        # Without position, sector or style limits the problem has a closed form
+        if key not in self._generated_solvers and not any(self._limits_structure(limits)):
+            optimized_weights = self._closed_form_mean_variance(returns, cov, key[2])
+            if optimized_weights is not None:
+                return optimized_weights, common_assets
+        
+        problem, weights, params = self._mean_variance_problem(key, limits)
+        
+        # Update parameter values
+        params['returns'].value = returns
+        params['cov_factor'].value = cov_factor
+        self._set_limit_parameters(params, limits)
+        
+        # Solve optimization problem
+        if key in self._generated_solvers:
+            problem.solve(method='CPG')
+        else:
+            problem.solve(solver=cp.OSQP, warm_start=True, enforce_dpp=True, polish=True,
+                          eps_abs=1e-7, eps_rel=1e-7, max_iter=20000, verbose=False)
+        
+        if problem.status not in ["optimal", "optimal_inaccurate"]:
+            raise ValueError(f"Optimization failed with status: {problem.status}")
+        
+        # Return optimized weights
+        return weights.value, common_assets
+    
+    def generate_solver(self, expected_returns, cov_matrix, constraints=None, code_dir='cpg_mean_variance'):
+        """
+        Generate and register a CVXPYgen C solver for a mean-variance problem structure.
+        
+        The structure (number of aligned assets and which constraints are
+        present) is taken from the given inputs. Later optimize calls with the
+        same structure use the generated solver. Requires the optional
+        cvxpygen package.
+        
+        Parameters:
+        -----------
+        expected_returns : pandas.Series
+            Series with expected returns for each ticker.
+        cov_matrix : pandas.DataFrame
+            Covariance matrix of asset returns.
+        constraints : dict, optional
+            Dictionary with optimization constraints.
+        code_dir : str, optional
+            Directory the generated code is written to; its name must be a
+            valid Python module name.
+        """
+        if cpg is None:
+            raise ImportError("cvxpygen is required to generate a solver")
+        
         common_assets = expected_returns.index.intersection(cov_matrix.index)
-        returns = expected_returns[common_assets].values
-        cov = cov_matrix.loc[common_assets, common_assets].values
+        key, limits = self._mean_variance_structure(common_assets, constraints)
+        problem, _, _ = self._mean_variance_problem(key, limits)
         
-        n = len(common_assets)
+        cpg.generate_code(problem, code_dir=code_dir, solver='OSQP')
+        
+        # Import the compiled solver and register it with the cached problem
+        code_dir = os.path.abspath(code_dir)
+        if os.path.dirname(code_dir) not in sys.path:
+            sys.path.insert(0, os.path.dirname(code_dir))
+        cpg_solver = import_module(f"{os.path.basename(code_dir)}.cpg_solver")
         
-        # Define optimization variables
-        weights = cp.Variable(n)
+        problem.register_solve('CPG', cpg_solver.cpg_solve)
+        self._generated_solvers.add(key)
+    
+    def _mean_variance_structure(self, common_assets, constraints):
+        """
+        Get the problem cache key and constraint limits for a mean-variance call.
+        
+        Parameters:
+        -----------
+        common_assets : pandas.Index
+            Assets in optimization order.
+        constraints : dict or None
+            Dictionary with optimization constraints.
+            
+        Returns:
+        --------
+        tuple
+            (cache key, limits dict from _constraint_limits)
+        """
+        market_neutral = bool(constraints and constraints.get('market_neutral', False))
+        limits = self._constraint_limits(constraints, common_assets)
+        key = ('mean_variance', len(common_assets), market_neutral) + self._limits_structure(limits)
+        
+        return key, limits
+    
+    def _mean_variance_problem(self, key, limits):
+        """
+        Get the cached mean-variance problem for a structure, building it on first use.
+        """
+        if key not in self._problems:
+            _, n, market_neutral = key[:3]
+            self._problems[key] = self._build_mean_variance_problem(n, market_neutral, limits)
+        
+        return self._problems[key]
+    
+    def _build_mean_variance_problem(self, n, market_neutral, limits):
+        """
+        Build a parametrized mean-variance problem.
+        
+        The risk term is written as a sum of squares of a covariance factor,
+        which keeps the problem DPP as CVXPYgen requires.
+        
+        Parameters:
+        -----------
+        n : int
+            Number of assets.
+        market_neutral : bool
+            If True, weights sum to 0 instead of 1.
+        limits : dict
+            Constraint limits from _constraint_limits, used for their structure.
+            
+        Returns:
+        --------
+        tuple
+            (problem, weights variable, dict of parameters)
+        """
+        # Define optimization variables and parameters
+        weights = cp.Variable(n, name='weights')
+        params = {
+            'returns': cp.Parameter(n, name='returns'),
+            'cov_factor': cp.Parameter((n, n), name='cov_factor'),
+        }
         
         # Define objective function (mean-variance utility)
-        returns_term = returns @ weights
-        risk_term = cp.quad_form(weights, cov)
+        returns_term = params['returns'] @ weights
+        risk_term = cp.sum_squares(params['cov_factor'] @ weights)
         objective = cp.Maximize(returns_term - self.risk_aversion * risk_term)
         
-        # Define constraints
-        constraint_list = []
-        
         # Basic constraint: weights sum to 1 (or 0 for market-neutral)
-        if constraints and constraints.get('market_neutral', False):
-            constraint_list.append(cp.sum(weights) == 0)
+        if market_neutral:
+            constraint_list = [cp.sum(weights) == 0]
         else:
-            constraint_list.append(cp.sum(weights) == 1)
+            constraint_list = [cp.sum(weights) == 1]
+        
+        constraint_list += self._build_limit_constraints(weights, params, limits)
+        
+        return cp.Problem(objective, constraint_list), weights, params
+    
+    def _align_inputs(self, expected_returns, cov_matrix):
+        """
+        Align expected returns with the covariance matrix and factor the covariance.
+        
+        The asset alignment, covariance slice and its factor are cached for the
+        most recent covariance matrix object and expected-return index, so
+        repeated calls with the same matrix skip the pandas alignment and the
+        factorization. The cache assumes the matrix is not modified in place.
+        
+        Parameters:
+        -----------
+        expected_returns : pandas.Series
+            Series with expected returns for each ticker.
+        cov_matrix : pandas.DataFrame
+            Covariance matrix of asset returns.
+            
+        Returns:
+        --------
+        tuple
+            (common assets, aligned expected returns array, aligned covariance
+            array, covariance factor)
+        """
+        key = (tuple(expected_returns.index), id(cov_matrix))
+        cached = self._align_cache.get(key)
+        
+        # The cached matrix reference guards against a reused id
+        if cached is None or cached[0] is not cov_matrix:
+            common_assets = expected_returns.index.intersection(cov_matrix.index)
+            positions = expected_returns.index.get_indexer(common_assets)
+            
+            # Use the matrix as is when already aligned, else slice by position
+            if common_assets.equals(cov_matrix.index) and common_assets.equals(cov_matrix.columns):
+                cov = cov_matrix.to_numpy(dtype=np.float64)
+            else:
+                rows = cov_matrix.index.get_indexer(common_assets)
+                cols = cov_matrix.columns.get_indexer(common_assets)
+                cov = cov_matrix.to_numpy(dtype=np.float64)[np.ix_(rows, cols)]
+            
+            cached = (cov_matrix, common_assets, positions, cov, self._covariance_factor(cov))
+            self._align_cache.clear()
+            self._align_cache[key] = cached
+        
+        _, common_assets, positions, cov, cov_factor = cached
+        returns = expected_returns.to_numpy()[positions]
+        
+        return common_assets, returns, cov, cov_factor
+    
+    def _closed_form_mean_variance(self, returns, cov, market_neutral):
+        """
+        Solve mean-variance with only the budget constraint analytically.
+        
+        Maximizing returns @ w - risk_aversion * w @ cov @ w subject to
+        sum(w) = budget gives w = cov^-1 (returns - gamma) / (2 * risk_aversion),
+        with the multiplier gamma chosen to meet the budget.
+        
+        Parameters:
+        -----------
+        returns : numpy.ndarray
+            Aligned expected returns.
+        cov : numpy.ndarray
+            Aligned covariance matrix.
+        market_neutral : bool
+            If True, weights sum to 0 instead of 1.
+            
+        Returns:
+        --------
+        numpy.ndarray or None
+            Optimal weights, or None if the covariance matrix is singular.
+        """
+        budget = 0.0 if market_neutral else 1.0
+        
+        # A singular matrix has no unique solution; leave it to the solver
+        try:
+            solved = np.linalg.solve(cov, np.column_stack([returns, np.ones(len(returns))]))
+        except np.linalg.LinAlgError:
+            return None
+        if not np.isfinite(solved).all():
+            return None
+        
+        inv_cov_returns, inv_cov_ones = solved[:, 0], solved[:, 1]
+        gamma = (inv_cov_returns.sum() - 2 * self.risk_aversion * budget) / inv_cov_ones.sum()
+        
+        return (inv_cov_returns - gamma * inv_cov_ones) / (2 * self.risk_aversion)
+    
+    def _covariance_factor(self, cov):
+        """
+        Compute a matrix F with F.T @ F equal to the covariance matrix.
+        
+        Parameters:
+        -----------
+        cov : numpy.ndarray
+            Covariance matrix.
+            
+        Returns:
+        --------
+        numpy.ndarray
+            Transposed Cholesky factor, or a symmetric square-root factor if
+            the matrix is only positive semidefinite.
+        """
+        try:
+            return np.linalg.cholesky(cov).T
+        except np.linalg.LinAlgError:
+            eigenvalues, eigenvectors = np.linalg.eigh(cov)
+            return (eigenvectors * np.sqrt(np.clip(eigenvalues, 0, None))).T
+    
+    def _constraint_limits(self, constraints, common_assets):
+        """
+        Extract position, sector and style limits for the aligned assets.
+        
+        Parameters:
+        -----------
+        constraints : dict or None
+            Dictionary with optimization constraints.
+        common_assets : pandas.Index
+            Assets in optimization order.
+            
+        Returns:
+        --------
+        dict
+            Finite position bounds ('min_position', 'max_position' or None),
+            and for sector and style exposures a tuple of (exposure matrix with
+            one row per limit, lower bounds, upper bounds) or None.
+        """
+        limits = {'min_position': None, 'max_position': None,
+                  'sector_exposures': None, 'style_exposures': None}
+        if not constraints:
+            return limits
         
         # Position limits
-        if constraints and 'position_limits' in constraints:
+        if 'position_limits' in constraints:
             pos_limits = constraints['position_limits']
             min_position = pos_limits.get('min_position', -np.inf)
             max_position = pos_limits.get('max_position', np.inf)
-            constraint_list.append(weights >= min_position)
-            constraint_list.append(weights <= max_position)
+            if np.isfinite(min_position):
+                limits['min_position'] = min_position
+            if np.isfinite(max_position):
+                limits['max_position'] = max_position
         
         # Sector exposure constraints
-        if constraints and 'sector_exposures' in constraints:
+        if 'sector_exposures' in constraints:
             sector_data = constraints['sector_exposures']['data']
             sector_limits = constraints['sector_exposures']['limits']
             
-            for sector, (min_exp, max_exp) in sector_limits.items():
-                sector_stocks = sector_data[sector_data == sector].index
-                sector_indices = [i for i, asset in enumerate(common_assets) if asset in sector_stocks]
-                sector_exposure = cp.sum([weights[i] for i in sector_indices])
-                
-                constraint_list.append(sector_exposure >= min_exp)
-                constraint_list.append(sector_exposure <= max_exp)
+            membership = self._sector_matrix(sector_data, common_assets, list(sector_limits))
+            
+            bounds = np.array(list(sector_limits.values()), dtype=float).reshape(-1, 2)
+            limits['sector_exposures'] = (membership, bounds[:, 0], bounds[:, 1])
         
         # Style factor constraints
-        if constraints and 'style_exposures' in constraints:
+        if 'style_exposures' in constraints:
             factor_data = constraints['style_exposures']['data']
             factor_limits = constraints['style_exposures']['limits']
             
-            for factor, (min_exp, max_exp) in factor_limits.items():
-                factor_exposures = factor_data[factor].reindex(common_assets).fillna(0).values
-                factor_exposure = factor_exposures @ weights
-                
-                constraint_list.append(factor_exposure >= min_exp)
-                constraint_list.append(factor_exposure <= max_exp)
+            # Reindex all limited factors at once
+            exposures = factor_data[list(factor_limits)].reindex(common_assets).fillna(0).to_numpy(dtype=float).T
+            
+            bounds = np.array(list(factor_limits.values()), dtype=float).reshape(-1, 2)
+            limits['style_exposures'] = (exposures, bounds[:, 0], bounds[:, 1])
         
-        # Solve optimization problem
-        problem = cp.Problem(objective, constraint_list)
-        problem.solve()
+        return limits
+    
+    def _sector_matrix(self, sector_data, common_assets, sectors):
+        """
+        Get the sector membership matrix, reusing it while the inputs are unchanged.
         
-        if problem.status not in ["optimal", "optimal_inaccurate"]:
-            raise ValueError(f"Optimization failed with status: {problem.status}")
+        Parameters:
+        -----------
+        sector_data : pandas.Series
+            Series mapping tickers to sectors.
+        common_assets : pandas.Index
+            Assets in optimization order.
+        sectors : list
+            Sectors with exposure limits, one matrix row each.
+            
+        Returns:
+        --------
+        numpy.ndarray
+            Matrix with one row per sector and 1.0 for the sector's assets.
+        """
+        key = (id(sector_data), tuple(common_assets), tuple(sectors))
+        cached = self._sector_cache.get(key)
+        
+        # The cached Series reference guards against a reused id
+        if cached is None or cached[0] is not sector_data:
+            # Align sectors to the assets once and compare against every limited sector
+            asset_sectors = sector_data.reindex(common_assets).to_numpy()
+            sector_names = np.array(sectors, dtype=object)
+            membership = (asset_sectors[None, :] == sector_names[:, None]).astype(float)
+            
+            cached = (sector_data, membership)
+            self._sector_cache.clear()
+            self._sector_cache[key] = cached
         
-        # Return optimized weights
-        optimized_weights = pd.Series(weights.value, index=common_assets)
+        return cached[1]
+    
+    def _limits_structure(self, limits):
+        """
+        Describe which limits are present, for use in a problem cache key.
+        """
+        return (
+            limits['min_position'] is not None,
+            limits['max_position'] is not None,
+            *(0 if limits[name] is None else len(limits[name][1])
+              for name in ('sector_exposures', 'style_exposures')),
+        )
+    
+    def _build_limit_constraints(self, weights, params, limits, scale=None):
+        """
+        Create parametrized position, sector and style constraints.
+        
+        Parameters:
+        -----------
+        weights : cvxpy.Variable
+            Portfolio weights.
+        params : dict
+            Dictionary the new parameters are added to.
+        limits : dict
+            Constraint limits from _constraint_limits, used for their structure.
+        scale : cvxpy.Expression, optional
+            Sum of the weights when they are not normalized to one; the
+            limits are multiplied by it.
+            
+        Returns:
+        --------
+        list
+            CVXPY constraints.
+        """
+        n = weights.shape[0]
+        constraint_list = []
         
-        return optimized_weights
+        def bound(param):
+            return param if scale is None else param * scale
+        
+        # Position limits
+        if limits['min_position'] is not None:
+            params['min_position'] = cp.Parameter(name='min_position')
+            constraint_list.append(weights >= bound(params['min_position']))
+        if limits['max_position'] is not None:
+            params['max_position'] = cp.Parameter(name='max_position')
+            constraint_list.append(weights <= bound(params['max_position']))
+        
+        # Sector and style exposure constraints
+        for name in ('sector_exposures', 'style_exposures'):
+            if limits[name] is None or len(limits[name][1]) == 0:
+                continue
+            
+            k = len(limits[name][1])
+            params[name] = (cp.Parameter((k, n), name=f'{name}_matrix'),
+                            cp.Parameter(k, name=f'{name}_min'),
+                            cp.Parameter(k, name=f'{name}_max'))
+            exposure_matrix, min_exposure, max_exposure = params[name]
+            exposure = exposure_matrix @ weights
+            
+            constraint_list.append(exposure >= bound(min_exposure))
+            constraint_list.append(exposure <= bound(max_exposure))
+        
+        return constraint_list
+    
+    def _set_limit_parameters(self, params, limits):
+        """
+        Assign current limit values to the parameters of a cached problem.
+        """
+        for name in ('min_position', 'max_position'):
+            if limits[name] is not None:
+                params[name].value = limits[name]
+        
+        for name in ('sector_exposures', 'style_exposures'):
+            if name in params:
+                for param, value in zip(params[name], limits[name]):
+                    param.value = value
     
     def _risk_parity_optimization(self, cov_matrix, constraints=None):
         """
         Perform risk parity optimization.
         
+        Uses cyclical coordinate descent, falling back to SLSQP when a maximum
+        position limit is binding or the descent does not converge.
+        
         Parameters:
         -----------
         cov_matrix : pandas.DataFrame
@@ -148,19 +679,23 @@ class PortfolioOptimizer:
             
         Returns:
         --------
-        pandas.Series
-            Series with optimized weights.
+        tuple
+            (numpy.ndarray of optimized weights, pandas.Index of tickers)
         """
         assets = cov_matrix.index
         n = len(assets)
-        cov = cov_matrix.values
+        cov = np.ascontiguousarray(cov_matrix.values, dtype=np.float64)
         
-        # Define the risk parity objective function
-        def risk_parity_objective(weights):
-            weights = np.array(weights).reshape(-1, 1)
-            portfolio_risk = np.sqrt(weights.T @ cov @ weights)[0, 0]
-            asset_contributions = np.multiply(weights, (cov @ weights)) / portfolio_risk
-            return np.sum(np.square(asset_contributions - portfolio_risk / n))
+        # Position limits
+        max_position = None
+        if constraints and 'position_limits' in constraints:
+            max_position = constraints['position_limits'].get('max_position', 1.0)
+        
+        # Coordinate descent solves the uncapped problem directly; use it
+        # unless the position cap binds
+        weights, converged = _risk_parity_ccd(cov)
+        if converged and np.all(np.isfinite(weights)) and (max_position is None or weights.max() <= max_position):
+            return weights, assets
         
         # Initial guess: equal weights
         initial_weights = np.ones(n) / n
@@ -174,17 +709,16 @@ class PortfolioOptimizer:
         # Bounds: non-negative weights (risk parity typically doesn't use shorts)
         bounds = [(0.0, None) for _ in range(n)]
         
-        # Position limits
-        if constraints and 'position_limits' in constraints:
-            pos_limits = constraints['position_limits']
-            max_position = pos_limits.get('max_position', 1.0)
+        if max_position is not None:
             bounds = [(0.0, max_position) for _ in range(n)]
         
         # Solve optimization problem
         result = minimize(
-            risk_parity_objective,
+            _risk_parity_objective,
             initial_weights,
+            args=(cov, 1.0 / n),
             method='SLSQP',
+            jac=_risk_parity_gradient,
             bounds=bounds,
             constraints=constraints_list,
             options={'ftol': 1e-12, 'maxiter': 1000}
@@ -194,9 +728,7 @@ class PortfolioOptimizer:
             raise ValueError(f"Risk parity optimization failed: {result.message}")
         
         # Return optimized weights
-        optimized_weights = pd.Series(result.x, index=assets)
-        
-        return optimized_weights
+        return result.x, assets
     
     def _max_sharpe_optimization(self, expected_returns, cov_matrix, constraints=None):
         """
@@ -213,59 +745,83 @@ class PortfolioOptimizer:
             
         Returns:
         --------
-        pandas.Series
-            Series with optimized weights.
+        tuple
+            (numpy.ndarray of optimized weights, pandas.Index of tickers)
         """
         # Align data
-        common_assets = expected_returns.index.intersection(cov_matrix.index)
-        returns = expected_returns[common_assets].values
-        cov = cov_matrix.loc[common_assets, common_assets].values
+        common_assets, returns, _, cov_factor = self._align_inputs(expected_returns, cov_matrix)
         
         n = len(common_assets)
         
-        # Define optimization variables
-        weights = cp.Variable(n)
-        aux_var = cp.Variable(1, nonneg=True)  # Auxiliary variable for reformulating max Sharpe
+        # Style exposures are not used for max Sharpe
+        if constraints and 'style_exposures' in constraints:
+            constraints = {k: v for k, v in constraints.items() if k != 'style_exposures'}
+        limits = self._constraint_limits(constraints, common_assets)
         
-        # Define the objective function (maximize Sharpe ratio)
-        objective = cp.Maximize(returns @ weights)
+        # Build the problem for this structure on first use
+        key = ('max_sharpe', n) + self._limits_structure(limits)
+        if key not in self._problems:
+            self._problems[key] = self._build_max_sharpe_problem(n, limits)
+        problem, scaled_weights, params = self._problems[key]
         
-        # Define constraints
-        constraint_list = []
+        # Update parameter values
+        params['returns'].value = returns
+        params['cov_factor'].value = cov_factor
+        self._set_limit_parameters(params, limits)
         
-        # Basic constraints for max Sharpe reformulation
-        constraint_list.append(cp.quad_form(weights, cov) <= aux_var)
-        constraint_list.append(cp.sum(weights) == 1)
-        
-        # Position limits
-        if constraints and 'position_limits' in constraints:
-            pos_limits = constraints['position_limits']
-            min_position = pos_limits.get('min_position', -np.inf)
-            max_position = pos_limits.get('max_position', np.inf)
-            constraint_list.append(weights >= min_position)
-            constraint_list.append(weights <= max_position)
-        
-        # Sector exposure constraints
-        if constraints and 'sector_exposures' in constraints:
-            sector_data = constraints['sector_exposures']['data']
-            sector_limits = constraints['sector_exposures']['limits']
-            
-            for sector, (min_exp, max_exp) in sector_limits.items():
-                sector_stocks = sector_data[sector_data == sector].index
-                sector_indices = [i for i, asset in enumerate(common_assets) if asset in sector_stocks]
-                sector_exposure = cp.sum([weights[i] for i in sector_indices])
-                
-                constraint_list.append(sector_exposure >= min_exp)
-                constraint_list.append(sector_exposure <= max_exp)
-        
-        # Solve optimization problem
-        problem = cp.Problem(objective, constraint_list)
-        problem.solve()
+        # Solve the cone program with SCS, starting from the previous solution
+        problem.solve(solver=cp.SCS, warm_start=True, enforce_dpp=True, eps=1e-8, use_indirect=False)
         
         if problem.status not in ["optimal", "optimal_inaccurate"]:
             raise ValueError(f"Optimization failed with status: {problem.status}")
         
-        # Return optimized weights
-        optimized_weights = pd.Series(weights.value / aux_var.value, index=common_assets)
+        # Scale the solution back to weights summing to one; a sum near zero
+        # means the Sharpe ratio only approaches its maximum with unbounded leverage
+        total = scaled_weights.value.sum()
+        if total <= 1e-6 * np.abs(scaled_weights.value).sum():
+            raise ValueError("Optimization failed: no fully invested portfolio attains the maximum Sharpe ratio")
+        return scaled_weights.value / total, common_assets
+    
+    def _build_max_sharpe_problem(self, n, limits):
+        """
+        Build a parametrized maximum Sharpe ratio problem.
         
-        return optimized_weights 
\ No newline at end of file
+        The Sharpe ratio is not concave, so the problem is solved in its
+        homogenized form: with y = w / (returns @ w), minimize the variance of
+        y subject to returns @ y == 1. The weights are y / sum(y), and the
+        limits, which are stated for weights summing to one, are multiplied
+        by sum(y). As for mean-variance, the variance is written as the sum of
+        squares of a covariance factor rather than a quadratic form.
+        
+        Parameters:
+        -----------
+        n : int
+            Number of assets.
+        limits : dict
+            Constraint limits from _constraint_limits, used for their structure.
+            
+        Returns:
+        --------
+        tuple
+            (problem, scaled weights variable, dict of parameters)
+        """
+        # Define optimization variables and parameters
+        scaled_weights = cp.Variable(n)
+        params = {
+            'returns': cp.Parameter(n),
+            'cov_factor': cp.Parameter((n, n)),
+        }
+        
+        # Minimize variance per unit of expected return
+        objective = cp.Minimize(cp.sum_squares(params['cov_factor'] @ scaled_weights))
+        
+        # The scale sum(y) must be positive for the weights to sum to one
+        scale = cp.sum(scaled_weights)
+        constraint_list = [
+            params['returns'] @ scaled_weights == 1,
+            scale >= 0,
+        ]
+        
+        constraint_list += self._build_limit_constraints(scaled_weights, params, limits, scale)
+        
+        return cp.Problem(objective, constraint_list), scaled_weights, params
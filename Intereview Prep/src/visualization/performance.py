@@ -4,6 +4,8 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from matplotlib.ticker import FuncFormatter
 
+from src.backtest.metrics import calculate_drawdowns
+
 class PerformanceVisualizer:
     """
     Visualization tools for analyzing strategy performance.
@@ -21,6 +23,10 @@ class PerformanceVisualizer:
         self.figsize = figsize
         self.style_setup()
         
+        # Cumulative returns of the two most recent return series (a strategy
+        # and its benchmark), keyed by id() of the series they came from
+        self._cum_return_cache = {}
+        
     def style_setup(self):
         """Set up the style for visualization."""
         # Use seaborn style
@@ -31,6 +37,41 @@ class PerformanceVisualizer:
         plt.rcParams['xtick.labelsize'] = 10
         plt.rcParams['ytick.labelsize'] = 10
         
+    def _cumulative_returns(self, returns):
+        """
+        Compound a return series as exp(cumsum(log1p(r))) - 1.
+        
+        Results are cached for the two most recent series objects, so plots of
+        the same strategy and benchmark share one computation. The cache assumes
+        the series are not modified in place. Missing returns are skipped as in
+        cumprod.
+        
+        Parameters:
+        -----------
+        returns : pandas.Series
+            Series with periodic returns.
+            
+        Returns:
+        --------
+        numpy.ndarray
+            Cumulative returns aligned with the input.
+        """
+        cached = self._cum_return_cache.get(id(returns))
+        
+        # The cached series reference guards against a reused id
+        if cached is None or cached[0] is not returns:
+            log_returns = np.log1p(returns.to_numpy(dtype=np.float64))
+            cum_returns = np.expm1(np.nancumsum(log_returns))
+            cum_returns[np.isnan(log_returns)] = np.nan
+            
+            cached = (returns, cum_returns)
+            self._cum_return_cache.pop(id(returns), None)
+            if len(self._cum_return_cache) >= 2:
+                del self._cum_return_cache[next(iter(self._cum_return_cache))]
+            self._cum_return_cache[id(returns)] = cached
+        
+        return cached[1]
+    
     def plot_cumulative_returns(self, returns, benchmark_returns=None, title="Cumulative Returns"):
         """
         Plot cumulative returns of the strategy and benchmark.
@@ -52,15 +93,15 @@ class PerformanceVisualizer:
         fig, ax = plt.subplots(figsize=self.figsize)
         
         # Calculate cumulative returns
-        cum_returns = (1 + returns).cumprod() - 1
+        cum_returns = self._cumulative_returns(returns)
         
         # Plot strategy returns
-        ax.plot(cum_returns.index, cum_returns.values * 100, label='Strategy', linewidth=2)
+        ax.plot(returns.index, cum_returns * 100, label='Strategy', linewidth=2)
         
         # Plot benchmark returns if provided
         if benchmark_returns is not None:
-            cum_benchmark = (1 + benchmark_returns).cumprod() - 1
-            ax.plot(cum_benchmark.index, cum_benchmark.values * 100, label='Benchmark', 
+            cum_benchmark = self._cumulative_returns(benchmark_returns)
+            ax.plot(benchmark_returns.index, cum_benchmark * 100, label='Benchmark', 
                    linewidth=2, linestyle='--', alpha=0.7)
         
         # Add percent formatter to y-axis
@@ -102,14 +143,11 @@ class PerformanceVisualizer:
         """
         fig, ax = plt.subplots(figsize=self.figsize)
         
-        # Calculate cumulative returns
-        cum_returns = (1 + returns).cumprod()
-        
-        # Calculate running maximum
-        running_max = cum_returns.cummax()
+        # Calculate cumulative wealth
+        wealth = 1 + self._cumulative_returns(returns)
         
-        # Calculate drawdowns
-        drawdowns = (cum_returns / running_max - 1) * 100
+        # Calculate drawdowns from the running maximum
+        drawdowns = pd.Series(calculate_drawdowns(wealth) * 100, index=returns.index)
         
         # Plot drawdowns
         ax.fill_between(drawdowns.index, drawdowns.values, 0, color='red', alpha=0.3)
@@ -170,41 +208,41 @@ class PerformanceVisualizer:
         list
             List of tuples with (start_date, end_date, recovery_date, drawdown_value)
         """
+        values = drawdowns.to_numpy(dtype=np.float64)
+        dates = drawdowns.index
+        
+        # Each drawdown is a run of values below zero; find the runs from the
+        # edges of the underwater mask
+        underwater = ~(values >= 0)
+        edges = np.diff(underwater.astype(np.int8), prepend=0, append=0)
+        run_starts = np.flatnonzero(edges == 1)
+        run_ends = np.flatnonzero(edges == -1)
+        
+        if len(run_starts) == 0:
+            return []
+        
+        # Deepest point of each run (missing values never count as the minimum)
+        depths = np.where(np.isnan(values), np.inf, values)
+        run_minima = np.minimum.reduceat(depths, run_starts)
+        
+        # Largest drawdowns first; ties keep chronological order
+        candidates = np.flatnonzero(run_minima < 0)
+        largest = candidates[np.argsort(run_minima[candidates], kind='stable')[:n]]
+        
         # Initialize result list
         result = []
         
-        # Create a copy to avoid modifying the original
-        dd_copy = drawdowns.copy()
-        
-        for _ in range(n):
-            # Find the lowest point of the drawdown
-            min_idx = dd_copy.idxmin()
-            min_value = dd_copy.loc[min_idx]
-            
-            if min_value >= 0:
-                break  # No more drawdowns
-                
-            # Find start of the drawdown (last time drawdown was 0 before the min)
-            try:
-                start_idx = dd_copy.loc[:min_idx][dd_copy.loc[:min_idx] >= 0].index[-1]
-            except IndexError:
-                start_idx = dd_copy.index[0]
-                
-            # Find end of the drawdown (first time drawdown was at min)
-            end_idx = min_idx
+        for run in largest:
+            run_start, run_end = run_starts[run], run_ends[run]
+            min_pos = run_start + np.argmin(depths[run_start:run_end])
             
-            # Find recovery date (first time drawdown returns to 0 after min)
-            recovery_mask = dd_copy.loc[end_idx:] >= 0
-            recovery_idx = recovery_mask.idxmax() if recovery_mask.any() else None
+            # Start is the last non-negative date before the run, end the
+            # lowest point and recovery the first non-negative date after it
+            start_idx = dates[run_start - 1] if run_start > 0 else dates[0]
+            end_idx = dates[min_pos]
+            recovery_idx = dates[run_end] if run_end < len(values) else None
             
-            # Add to results
-            result.append(((start_idx, end_idx, recovery_idx), min_value))
-            
-            # Mask this drawdown period to find the next largest
-            if recovery_idx:
-                dd_copy.loc[start_idx:recovery_idx] = 0
-            else:
-                dd_copy.loc[start_idx:] = 0
+            result.append(((start_idx, end_idx, recovery_idx), values[min_pos]))
         
         return result
     
@@ -232,34 +270,58 @@ class PerformanceVisualizer:
             figsize = self.figsize
         
         # Use 'ME' (month end) instead of deprecated 'M'
-        monthly_returns = returns.resample('ME').apply(lambda x: (1 + x).prod() - 1)
-        
-        # Convert to a DataFrame with year and month dimensions
-        monthly_return_table = pd.DataFrame({
-            'Year': monthly_returns.index.year,
-            'Month': monthly_returns.index.month,
-            'Return': monthly_returns.values
-        })
-        
-        # Pivot to get years as rows and months as columns
-        return_pivot = monthly_return_table.pivot(index='Year', columns='Month', values='Return')
-        
-        # Map month numbers to month names
-        month_names = {1: 'Jan', 2: 'Feb', 3: 'Mar', 4: 'Apr', 5: 'May', 6: 'Jun',
-                      7: 'Jul', 8: 'Aug', 9: 'Sep', 10: 'Oct', 11: 'Nov', 12: 'Dec'}
-        return_pivot.columns = [month_names[m] for m in return_pivot.columns]
+        monthly_returns = (1 + returns).resample('ME').prod() - 1
+        
+        # Fill a years x months table directly by integer position
+        years = monthly_returns.index.year.to_numpy()
+        months = monthly_returns.index.month.to_numpy() - 1
+        first_year = years.min()
+        table = np.full((years.max() - first_year + 1, 12), np.nan)
+        table[years - first_year, months] = monthly_returns.to_numpy()
+        
+        # Keep only the months that occur in the data
+        month_names = np.array(['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                                'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'])
+        observed = np.zeros(12, dtype=bool)
+        observed[months] = True
+        return_pivot = pd.DataFrame(table[:, observed], columns=month_names[observed],
+                                    index=pd.Index(np.arange(first_year, years.max() + 1), name='Year'))
         
         # Create heatmap
         fig, ax = plt.subplots(figsize=figsize)
         
-        # Calculate maximum absolute return for symmetric color scale
-        max_abs_return = max(abs(return_pivot.min().min()), abs(return_pivot.max().max()))
+        values = return_pivot.to_numpy() * 100
         
-        # Create heatmap
-        sns.heatmap(return_pivot * 100, ax=ax, cmap=cmap, center=0,
-                   annot=True, fmt=".1f", linewidths=0.5,
-                   vmin=-max_abs_return * 100, vmax=max_abs_return * 100,
-                   cbar_kws={'label': 'Return (%)'})
+        # Calculate maximum absolute return for symmetric color scale
+        max_abs_return = np.nanmax(np.abs(values))
+        norm = plt.Normalize(vmin=-max_abs_return, vmax=max_abs_return)
+        colormap = plt.get_cmap(cmap)
+        
+        # Draw the cells in one image; missing months stay blank
+        image = ax.imshow(np.ma.masked_invalid(values), cmap=colormap, norm=norm, aspect='auto')
+        fig.colorbar(image, ax=ax, label='Return (%)')
+        
+        # White cell borders
+        ax.grid(False)
+        ax.set_xticks(np.arange(values.shape[1] + 1) - 0.5, minor=True)
+        ax.set_yticks(np.arange(values.shape[0] + 1) - 0.5, minor=True)
+        ax.grid(which='minor', color='white', linewidth=0.5)
+        ax.tick_params(which='minor', length=0)
+        
+        ax.set_xticks(np.arange(values.shape[1]))
+        ax.set_xticklabels(return_pivot.columns)
+        ax.set_yticks(np.arange(values.shape[0]))
+        ax.set_yticklabels(return_pivot.index)
+        
+        # Format labels and pick black or white text from each cell's
+        # relative luminance up front, then only place the text
+        labels = np.char.mod('%.1f', values)
+        rgb = colormap(norm(values))[..., :3]
+        rgb = np.where(rgb <= 0.03928, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+        text_colors = np.where(rgb @ [0.2126, 0.7152, 0.0722] > 0.408, 'black', 'white')
+        
+        for row, col in zip(*np.nonzero(np.isfinite(values))):
+            ax.text(col, row, labels[row, col], ha='center', va='center', color=text_colors[row, col])
         
         # Set title and labels
         ax.set_title(title)
@@ -326,18 +388,17 @@ class PerformanceVisualizer:
         matplotlib.figure.Figure
             Figure object.
         """
-        # Calculate factor contributions
-        contributions = pd.DataFrame(index=returns.index, columns=factor_returns.columns)
-        
-        for factor in factor_returns.columns:
-            if factor in exposures.columns:
-                contributions[factor] = exposures[factor] * factor_returns[factor]
+        # Calculate factor contributions in one aligned multiplication
+        # (factors without exposures contribute nothing)
+        common_factors = factor_returns.columns.intersection(exposures.columns)
+        contributions = (exposures[common_factors] * factor_returns[common_factors]).reindex(
+            index=returns.index, columns=factor_returns.columns)
         
         # Calculate unexplained returns
         contributions['Unexplained'] = returns - contributions.sum(axis=1)
         
         # Resample to monthly for better visualization
-        monthly_contrib = contributions.resample('M').sum()
+        monthly_contrib = contributions.resample('ME').sum()
         
         # Plot stacked bar chart
         fig, ax = plt.subplots(figsize=self.figsize)
@@ -2,21 +2,97 @@ import tkinter as tk
 import ttkbootstrap
 from tkinter import filedialog, messagebox, simpledialog, scrolledtext
 from tkinter import ttk
-from datetime import datetime
+from datetime import datetime, timedelta
 from threading import Lock
+import asyncio
+import bisect
 import os
-import json
-import schedule
 import time
+import sys
+import json
+import re
 import threading
-import subprocess
 import logging
+import logging.handlers
 import traceback
 from ttkbootstrap import Style
-from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import contextlib
+import io
+import itertools
+import runpy
+import codecs
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard library encoder is used without it
+    orjson = None
 
 SCRIPT_STORAGE_FILE = "scripts.json"
 LOG_FILE = "execution_logs.txt"
+LOG_MAX_BYTES = 1_000_000  # Size at which the log file is rotated
+LOG_BACKUP_COUNT = 3  # Rotated log files kept next to the current one
+LOG_TAIL_BYTES = 128 * 1024  # Amount of the end of the log file shown in the log viewer
+SAVE_DELAY_SECONDS = 0.5  # Changes made within this long of each other are saved together
+EXISTS_TTL_SECONDS = 2.0  # How long a script's existence check is reused
+MAX_OUTPUT_LINES = 5000  # Lines kept in the output panel; older lines are dropped
+OUTPUT_FLUSH_MS = 50  # Output arriving within this long is inserted into the panel together
+MAX_IDLE_SECONDS = 60  # Longest timer wait before a job's delay is recomputed, so wall-clock changes are noticed
+
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+_TIME_RE = re.compile(r"^([01]?\d|2[0-3]):([0-5]?\d)$")
+
+# Compact encoder reused for every save when orjson is not installed
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+# Keys added to script dicts at runtime and not written to the storage file
+_RUNTIME_KEYS = ("basename", "argv")
+
+# Parsed script lists keyed by storage path, with the (mtime_ns, size) they were read at
+_scripts_cache = {}
+
+def _exec_script_worker(file_path):
+    """
+    Run a script inside a warm pool worker and capture its output.
+
+    Mirrors running `python file_path`: the script runs as __main__ with its
+    directory first on sys.path, and exceptions or a non-zero exit status are
+    reported on stderr instead of ending the worker.
+
+    :param file_path: Path of the script to run
+    :return: Tuple of (stdout, stderr) text
+    """
+    stdout, stderr = io.StringIO(), io.StringIO()
+    saved_argv, saved_path = sys.argv[:], sys.path[:]
+    sys.argv = [file_path]
+    sys.path.insert(0, os.path.dirname(os.path.abspath(file_path)))
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                runpy.run_path(file_path, run_name="__main__")
+            except SystemExit as e:
+                if e.code not in (None, 0):
+                    print(f"Exited with status {e.code}", file=sys.stderr)
+            except Exception:
+                traceback.print_exc()
+    finally:
+        sys.argv, sys.path[:] = saved_argv, saved_path
+    return stdout.getvalue(), stderr.getvalue()
+
+def _parse_time(text):
+    """
+    Validate a 24-hour time and normalize it to HH:MM.
+
+    :param text: Time such as "9:05" or "09:05"
+    :return: The time as HH:MM, or None if it is not a valid time
+    """
+    match = _TIME_RE.match(text.strip())
+    if match is None:
+        return None
+    return f"{int(match.group(1)):02d}:{int(match.group(2)):02d}"
+
 
 class SchedulerStatus:
     RUNNING = "Running"
@@ -30,46 +106,165 @@ class ScriptManager:
     def __init__(self, storage_file=SCRIPT_STORAGE_FILE):
         self.storage_file = storage_file
         self.scripts = self.load_scripts()
+        self._last_saved = None  # Bytes last written to the storage file
+        self._pending_save = None  # Snapshot of the scripts waiting to be written
+        self._save_timer = None  # Timer that writes the pending snapshot
+        self._save_lock = Lock()  # Guards the pending snapshot and the timer
+        self._by_path = {}  # Script dicts keyed by file path
+        self._exists_cache = {}  # File path -> (monotonic time checked, exists)
+        self.sorted_scripts = []  # The scripts ordered by time, unscheduled last
+        self._sorted_keys = []  # Sort key of each entry in sorted_scripts, for bisect
+        self.version = 0  # Bumped on every change to the scripts
+        for script in self.scripts:
+            self._index_script(script)
+
+    def _index_script(self, script):
+        """Cache the script's file name and command line, and add it to the lookup indexes."""
+        script["basename"] = os.path.basename(script["file_path"])
+        script["argv"] = (sys.executable, "-u", script["file_path"])  # Unbuffered, so output streams
+        self._by_path[script["file_path"]] = script
+        self._insert_sorted(script)
+
+    @staticmethod
+    def _sort_key(script):
+        return script["time"] or "99:99", script["file_path"]
+
+    def _insert_sorted(self, script):
+        """Insert a script into sorted_scripts at its place in time order."""
+        key = self._sort_key(script)
+        index = bisect.bisect_left(self._sorted_keys, key)
+        self._sorted_keys.insert(index, key)
+        self.sorted_scripts.insert(index, script)
+
+    def _remove_sorted(self, script):
+        """Remove a script from sorted_scripts; call before changing its time."""
+        index = bisect.bisect_left(self._sorted_keys, self._sort_key(script))
+        del self._sorted_keys[index]
+        del self.sorted_scripts[index]
+
+    def get_script_by_path(self, file_path):
+        """
+        Look up a script by its file path.
+
+        :param file_path: The path of the script file
+        :return: The script dict, or None if there is no such script
+        """
+        return self._by_path.get(file_path)
+
+    def path_exists(self, file_path):
+        """
+        Check whether a script file exists, reusing checks made in the last EXISTS_TTL_SECONDS.
+
+        :param file_path: The path of the script file
+        :return: True if the file exists
+        """
+        now = time.monotonic()
+        cached = self._exists_cache.get(file_path)
+        if cached is not None and now - cached[0] < EXISTS_TTL_SECONDS:
+            return cached[1]
+        exists = os.path.exists(file_path)
+        self._exists_cache[file_path] = (now, exists)
+        return exists
 
     def load_scripts(self):
-        """Load scripts from storage file with error handling."""
+        """
+        Load scripts from storage file with error handling.
+
+        The parsed list is cached by the file's modification time and size, so
+        reloading an unchanged file skips decoding it. Each call returns fresh
+        script dicts so callers can modify them.
+        """
         if os.path.exists(self.storage_file):
             try:
-                with open(self.storage_file, "r") as file:
-                    return json.load(file)
+                st = os.stat(self.storage_file)
+                key = (st.st_mtime_ns, st.st_size)
+                cached = _scripts_cache.get(self.storage_file)
+                if cached is None or cached[0] != key:
+                    with open(self.storage_file, "rb") as file:
+                        data = file.read()
+                    cached = (key, orjson.loads(data) if orjson is not None else json.loads(data))
+                    _scripts_cache[self.storage_file] = cached
+                return [dict(script) for script in cached[1]]
             except (json.JSONDecodeError, IOError):
                 logging.error("Error reading scripts.json. Returning an empty list.")
                 return []
         return []
 
     def save_scripts(self):
-        with open(self.storage_file, "w") as file:
-            json.dump(self.scripts, file)
+        """
+        Save scripts to the storage file.
+
+        The scripts are snapshotted now and written SAVE_DELAY_SECONDS later on a
+        timer thread, so several changes in a row are written once. Every change
+        to the scripts is saved, so this is also where the version is bumped.
+        """
+        self.version += 1
+        scripts = [
+            {key: value for key, value in script.items() if key not in _RUNTIME_KEYS}
+            for script in self.scripts
+        ]
+        with self._save_lock:
+            self._pending_save = scripts
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(SAVE_DELAY_SECONDS, self.flush)
+                self._save_timer.start()
+
+    def flush(self):
+        """
+        Write any pending save to the storage file now.
+
+        Nothing is written if the content matches the last save. Otherwise the
+        file is replaced atomically through a temporary file, so a crash mid-write
+        cannot leave a truncated scripts.json.
+        """
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            scripts, self._pending_save = self._pending_save, None
+            if scripts is None:
+                return
+            data = orjson.dumps(scripts) if orjson is not None else _JSON_ENCODER.encode(scripts).encode()
+            if data == self._last_saved:
+                return
+            temp_file = self.storage_file + ".tmp"
+            with open(temp_file, "wb") as file:
+                file.write(data)
+            os.replace(temp_file, self.storage_file)
+            self._last_saved = data
 
     def add_script(self, file_path):
-        if not any(script["file_path"] == file_path for script in self.scripts):
-            self.scripts.append({"file_path": file_path, "time": None})
+        if file_path not in self._by_path:
+            script = {"file_path": file_path, "time": None}
+            self.scripts.append(script)
+            self._index_script(script)
             self.save_scripts()
             return True
         return False
 
-    def remove_script(self, file_name):
-        self.scripts = [s for s in self.scripts if os.path.basename(s["file_path"]) != file_name]
+    def remove_script(self, file_path):
+        script = self._by_path.pop(file_path, None)
+        if script is not None:
+            self._exists_cache.pop(file_path, None)
+            self._remove_sorted(script)
+            self.scripts.remove(script)
         self.save_scripts()
 
-    def update_script(self, file_name, time=None, frequency=None, weekday=None):
+    def update_script(self, file_path, time=None, frequency=None, weekday=None):
         """Update the schedule information for a script."""
-        for script in self.scripts:
-            if os.path.basename(script["file_path"]) == file_name:
-                if time is not None:
-                    script["time"] = time
-                if frequency is not None:
-                    script["frequency"] = frequency
-                if weekday is not None:
-                    script["weekday"] = weekday
-                self.save_scripts()
-                return True
-        return False
+        script = self._by_path.get(file_path)
+        if script is None:
+            return False
+        if time is not None and time != script["time"]:
+            self._remove_sorted(script)
+            script["time"] = time
+            self._insert_sorted(script)
+        if frequency is not None:
+            script["frequency"] = frequency
+        if weekday is not None:
+            script["weekday"] = weekday
+        self.save_scripts()
+        return True
 
 
 class SchedulerCore:
@@ -80,68 +275,141 @@ class SchedulerCore:
         :param run_script_func: A reference to the run_script method in SchedulerApp
         """
         self.is_running = False  # Default state is Not Running
-        self.jobs = []  # List of all scheduled jobs
-        self.thread = None  # Thread for running the scheduler
+        self.jobs = []  # List of all scheduled jobs, ordered by time
+        self._job_keys = []  # Sort key of each job in jobs, for bisect
+        self._jobs_by_path = {}  # The same jobs keyed by file path
+        self.thread = None  # Thread running the scheduler's asyncio event loop
+        self._loop = None  # Event loop the jobs' timers run on
+        self._handles = {}  # Timer handle of each job, keyed by file path; event loop thread only
         self.lock = Lock()  # Lock for thread safety
-        self.paused_scripts = set()  # Store paused script file names
+        self.paused_scripts = set()  # Store paused script file paths
+        self.version = 0  # Bumped on every change to the jobs or paused scripts
         self.run_script_func = run_script_func  # Reference to the run_script method
 
-    def add_job_with_frequency(self, time, job_func, file_name, frequency, weekday=None):
+    def add_job_with_frequency(self, time, job_func, file_path, frequency, weekday=None):
         """
         Add a job to the scheduler with the specified frequency and time.
 
+        A script has at most one job; scheduling it again replaces its previous job.
+
         :param time: Time in HH:MM format
-        :param job_func: The function to execute
-        :param file_name: The name of the script file
+        :param job_func: The function to execute; it is called with the file path
+        :param file_path: The path of the script file
         :param frequency: The frequency (e.g., "daily" or "weekly")
         :param weekday: The weekday (if weekly frequency)
         """
+        job = {"file_path": file_path, "time": time, "frequency": frequency, "weekday": weekday}
         with self.lock:
-            # Check if the job already exists
-            for job in self.jobs:
-                if (
-                    job["file_name"] == file_name
-                    and job["time"] == time
-                    and job["frequency"] == frequency
-                    and job.get("weekday") == weekday
-                ):
-                    logging.warning(f"Job already exists: {file_name} at {time} ({frequency} {weekday or ''})")
-                    return
-
-            # Schedule the job
-            if frequency == "daily":
-                schedule.every().day.at(time).do(job_func).tag(file_name)
-            elif frequency == "weekly" and weekday:
-                weekday_mapping = {
-                    "monday": schedule.every().monday,
-                    "tuesday": schedule.every().tuesday,
-                    "wednesday": schedule.every().wednesday,
-                    "thursday": schedule.every().thursday,
-                    "friday": schedule.every().friday,
-                    "saturday": schedule.every().saturday,
-                    "sunday": schedule.every().sunday,
-                }
-                if weekday in weekday_mapping:
-                    weekday_mapping[weekday].at(time).do(job_func).tag(file_name)
-
-            # Store the job details
-            self.jobs.append({"file_name": file_name, "time": time, "frequency": frequency, "weekday": weekday})
+            # Check if the job already exists, and drop the script's previous job if it differs
+            previous = self._jobs_by_path.get(file_path)
+            if previous != job:
+                if previous is not None:
+                    index = bisect.bisect_left(self._job_keys, (previous["time"], file_path))
+                    del self._job_keys[index]
+                    del self.jobs[index]
+                # Store the job details, keeping jobs in time order
+                self._jobs_by_path[file_path] = job
+                index = bisect.bisect_left(self._job_keys, (time, file_path))
+                self._job_keys.insert(index, (time, file_path))
+                self.jobs.insert(index, job)
+                self.version += 1
+
+        if previous == job:
+            logging.warning(f"Job already exists: {file_path} at {time} ({frequency} {weekday or ''})")
+            return
+        if previous is not None:
+            logging.info(f"Replacing job: {file_path} at {previous['time']} "
+                         f"({previous['frequency']} {previous['weekday'] or ''})")
+
+        # Schedule the job, replacing any timer left from the previous one
+        loop = self._ensure_loop()
+        loop.call_soon_threadsafe(self._cancel, file_path)
+        if frequency == "daily" or (frequency == "weekly" and weekday in WEEKDAYS):
+            loop.call_soon_threadsafe(self._arm, job, job_func)
 
     def start_scheduler(self):
         """Start the scheduler."""
         self.is_running = True
-        if not self.thread or not self.thread.is_alive():
-            self.thread = threading.Thread(target=self.run_scheduler, daemon=True)
+        self._ensure_loop()
+
+    def run_coroutine(self, coro):
+        """
+        Run a coroutine on the scheduler's event loop from any thread.
+
+        :param coro: The coroutine to run
+        :return: A concurrent.futures.Future for its result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def _ensure_loop(self):
+        """Start the event loop thread on first use and return the loop."""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self.thread = threading.Thread(target=self._loop.run_forever, daemon=True)
             self.thread.start()
+            logging.info("Scheduler thread started.")
+        return self._loop
 
-    def run_scheduler(self):
-        """Main loop for running the scheduler."""
-        logging.info("Scheduler thread started.")
-        while True:
-            if self.is_running:
-                with self.lock:
-                    schedule.run_pending()  # Run scheduled jobs
-            time.sleep(1)  # Sleep for 1 second between checks
+    @staticmethod
+    def _next_run(job, after):
+        """
+        Compute when a job is next due.
+
+        :param job: The job dict
+        :param after: The datetime the next run must come after
+        :return: The datetime of the next run
+        """
+        hour, minute = map(int, job["time"].split(":"))
+        target = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if job["frequency"] == "weekly":
+            target += timedelta(days=(WEEKDAYS.index(job["weekday"]) - after.weekday()) % 7)
+            if target <= after:
+                target += timedelta(days=7)
+        elif target <= after:
+            target += timedelta(days=1)
+        return target
+
+    def _arm(self, job, job_func, target=None):
+        """
+        Set a timer on the event loop for the job's next run (event loop thread only).
+
+        Timers run on the loop's monotonic clock while jobs are due by wall-clock
+        time, so long waits are split into MAX_IDLE_SECONDS steps that recompute
+        the remaining delay; a clock change or suspend cannot make a job run late.
+
+        :param job: The job dict
+        :param job_func: The function to execute; it is called with the file path
+        :param target: The datetime of the run being waited for; the next one if None
+        """
+        if target is None:
+            target = self._next_run(job, datetime.now())
+        delay = (target - datetime.now()).total_seconds()
+        if delay > MAX_IDLE_SECONDS:
+            handle = self._loop.call_later(MAX_IDLE_SECONDS, self._arm, job, job_func, target)
+        else:
+            handle = self._loop.call_later(max(delay, 0), self._fire, job, job_func, target)
+        self._handles[job["file_path"]] = handle
+
+    def _fire(self, job, job_func, target):
+        """Run a due job unless it or the scheduler is paused, then arm its next run (event loop thread only)."""
+        self._arm(job, job_func, self._next_run(job, target))
+        if self.is_running and job["file_path"] not in self.paused_scripts:
+            try:
+                job_func(job["file_path"])
+            except Exception:
+                logging.error(f"Failed to start job: {job['file_path']}\nTraceback: {traceback.format_exc()}")
+
+    def _cancel(self, file_path):
+        """Cancel a script's timer, if it has one (event loop thread only)."""
+        handle = self._handles.pop(file_path, None)
+        if handle is not None:
+            handle.cancel()
+
+    def _cancel_all(self):
+        """Cancel every job's timer (event loop thread only)."""
+        for handle in self._handles.values():
+            handle.cancel()
+        self._handles.clear()
 
     def pause_scheduler(self):
         """Pause the entire scheduler."""
@@ -151,78 +419,79 @@ class SchedulerCore:
         """Resume the entire scheduler."""
         self.is_running = True
 
+    def shutdown(self):
+        """Cancel all timers and stop the event loop thread."""
+        self.is_running = False
+        if self._loop is None:
+            return
+
+        def stop():
+            self._cancel_all()
+            self._loop.stop()
+
+        self._loop.call_soon_threadsafe(stop)
+        self.thread.join(timeout=1)
+        logging.info("Scheduler thread stopped.")
+
     def clear_jobs(self):
         """Clear all scheduled jobs."""
-        schedule.clear()
-        self.jobs.clear()
-
-    def pause_script(self, file_name):
+        with self.lock:
+            self.jobs.clear()
+            self._job_keys.clear()
+            self._jobs_by_path.clear()
+            self.version += 1
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._cancel_all)
+
+    def pause_script(self, file_path):
         """
-        Pause a specific script by its file name.
+        Pause a specific script by its file path.
 
-        :param file_name: The name of the script file to pause
+        Its timers keep running, but its runs are skipped while it is paused.
+
+        :param file_path: The path of the script file to pause
         """
         with self.lock:
-            self.paused_scripts.add(file_name)
-            schedule.clear(file_name)  # Remove the script's job from the schedule
+            self.paused_scripts.add(file_path)
+            self.version += 1
 
-    def resume_script(self, file_name):
+    def resume_script(self, file_path):
         with self.lock:
             # Exit early if the script is not in paused_scripts
-            if file_name not in self.paused_scripts:
-                logging.debug(f"Script '{file_name}' is not paused. Skipping resume.")
+            if file_path not in self.paused_scripts:
+                logging.debug(f"Script '{file_path}' is not paused. Skipping resume.")
                 return
 
-            # Remove from paused list
-            self.paused_scripts.remove(file_name)
-
-            # Clear existing scheduled jobs for this file_name
-            schedule.clear(file_name)
+            # Remove from paused list; its timers are still armed
+            self.paused_scripts.remove(file_path)
+            self.version += 1
 
-            # Re-schedule the job
             for job in self.jobs:
-                if job["file_name"] == file_name:
-                    job_func = partial(self.run_script_func, file_name=file_name)
-                    if job["frequency"] == "daily":
-                        schedule.every().day.at(job["time"]).do(job_func).tag(file_name)
-                    elif job["frequency"] == "weekly" and job.get("weekday"):
-                        weekday_mapping = {
-                            "monday": schedule.every().monday,
-                            "tuesday": schedule.every().tuesday,
-                            "wednesday": schedule.every().wednesday,
-                            "thursday": schedule.every().thursday,
-                            "friday": schedule.every().friday,
-                            "saturday": schedule.every().saturday,
-                            "sunday": schedule.every().sunday,
-                        }
-                        weekday_mapping[job["weekday"]].at(job["time"]).do(job_func).tag(file_name)
-
-                    logging.info(f"Resumed script: {file_name}")
-                    return  "resume call"# Exit after rescheduling the job
-
-    def _re_add_job(self, file_name):
+                if job["file_path"] == file_path:
+                    logging.info(f"Resumed script: {file_path}")
+                    return  "resume call"# Exit after resuming the job
+
+    def _re_add_job(self, file_path):
         """Re-add a paused job to the scheduler."""
         for job in self.jobs:
-            if job["file_name"] == file_name:
-                job_func = partial(self.run_script_func, file_name=file_name)
+            if job["file_path"] == file_path:
                 self.add_job_with_frequency(
                     job["time"],
-                    job_func,
-                    job["file_name"],
+                    self.run_script_func,
+                    job["file_path"],
                     job["frequency"],
                     job.get("weekday"),
                 )
-                logging.info(f"Resumed script: {file_name}")
+                logging.info(f"Resumed script: {file_path}")
 
-    def is_script_paused(self, file_name):
+    def is_script_paused(self, file_path):
         """
         Check if a specific script is paused.
 
-        :param file_name: The name of the script file
+        :param file_path: The path of the script file
         :return: True if the script is paused, False otherwise
         """
-        return file_name in self.paused_scripts
-
+        return file_path in self.paused_scripts
 class SchedulerApp:
     def __init__(self, root):
         self.root = root
@@ -230,39 +499,70 @@ class SchedulerApp:
         self.script_manager = ScriptManager()
         self.scheduler = SchedulerCore(self.run_script)  # Pass run_script to SchedulerCore
         self.current_scheduler_status = SchedulerStatus.NOT_RUNNING  # Track the current status
+        self._pool = None  # Warm interpreter pool for scripts marked "warm"
+        self._search_query = ""  # Filter applied to the script list
+        self._script_rows = {}  # Rows shown in the script list, keyed by file path
+        self._job_rows = {}  # Rows shown in the scheduled jobs list, keyed by file path
+        self._shown_versions = None  # (script, job) versions the lists were last refreshed at
+        self._refresh_pending = False  # Whether a refresh is queued for when Tk is idle
+        self._output_buffer = []  # (text, error) pairs waiting to be inserted into the output panel
+        self._output_flush_pending = False  # Whether _flush_output is scheduled
         self.init_logging()
         self.build_gui()
         self.schedule_saved_scripts()  # Schedule saved scripts at startup
-        self.auto_refresh_gui()
         self.update_scheduler_status(SchedulerStatus.NOT_RUNNING, color="red")  # Default to Not Running
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        """Stop the scheduler and the warm pool, save any pending changes, then close the window."""
+        self.scheduler.shutdown()
+        self.script_manager.flush()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
 
     def refresh_gui(self):
-        """Refresh the GUI components."""
+        """Refresh the GUI components, skipping the work if nothing has changed since the last refresh."""
+        versions = (self.script_manager.version, self.scheduler.version)
+        if versions == self._shown_versions:
+            return
+        self._shown_versions = versions
         self.update_script_tree()
         self.update_scheduled_jobs_tree()
 
+    def _invalidate_gui(self):
+        """Queue a GUI refresh for when Tk is idle; several changes in a row share one refresh."""
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.root.after_idle(self._do_refresh)
+
+    def _do_refresh(self):
+        self._refresh_pending = False
+        self.refresh_gui()
+
     def schedule_saved_scripts(self):
         """Schedule scripts with valid times, frequencies, and weekdays from scripts.json."""
         for script in self.script_manager.scripts:
-            if not os.path.exists(script["file_path"]):
+            if not self.script_manager.path_exists(script["file_path"]):
                 logging.warning(f"Script not found during initialization: {script['file_path']}")
                 continue
             if script["time"] and script.get("frequency"):  # Only schedule scripts with valid time and frequency
-                try:
-                    datetime.strptime(script["time"], "%H:%M")  # Validate time format
-                    file_name = os.path.basename(script["file_path"])
-                    job_func = partial(self.run_script, file_name=file_name)
-                    self.scheduler.add_job_with_frequency(
-                        script["time"], job_func, file_name, script["frequency"], script.get("weekday")
-                    )
-                except ValueError:
+                time = _parse_time(script["time"])
+                if time is None:
                     logging.error(f"Invalid time format for script: {script['file_path']}")
+                    continue
+                self.scheduler.add_job_with_frequency(
+                    time, self.run_script, script["file_path"], script["frequency"], script.get("weekday")
+                )
         # Update GUI after scheduling
         self.refresh_gui()
 
     def init_logging(self):
+        # One handler keeps the log file open for the whole session and caps its size
+        self._log_handler = logging.handlers.RotatingFileHandler(
+            LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT)
         logging.basicConfig(
-            filename=LOG_FILE,
+            handlers=[self._log_handler],
             level=logging.INFO,  # Set to DEBUG to capture all log levels
             format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         )
@@ -296,8 +596,8 @@ class SchedulerApp:
         search_entry.pack(side=tk.LEFT, padx=5)
         ttk.Button(search_frame, text="Search", style="primary.TButton",
                    command=lambda: self.search_scripts(search_entry.get())).pack(side=tk.LEFT, padx=5)
-        ttk.Button(search_frame, text="Reset", style="primary.TButton", command=self.update_script_tree).pack(
-            side=tk.LEFT, padx=5)
+        ttk.Button(search_frame, text="Reset", style="primary.TButton",
+                   command=lambda: self.search_scripts("")).pack(side=tk.LEFT, padx=5)
 
     def _build_script_section(self):
         script_frame = ttk.LabelFrame(self.root, text="Scripts", padding=(10, 5))
@@ -329,6 +629,8 @@ class SchedulerApp:
         self.script_list_tree.column("Frequency", width=100, stretch=tk.YES)
         self.script_list_tree.column("Weekday", width=100, stretch=tk.YES)
         self.script_list_tree.column("File Location", width=500, stretch=tk.YES)
+        self.script_list_tree.tag_configure("scheduled", background="lightgreen")
+        self.script_list_tree.tag_configure("paused", background="lightcoral")
 
     def _build_buttons_section(self):
         buttons_frame = ttk.Frame(self.root, padding=(10, 5))
@@ -421,6 +723,7 @@ class SchedulerApp:
         output_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         self.output_panel = scrolledtext.ScrolledText(output_frame, wrap=tk.WORD, height=10, state=tk.DISABLED)
         self.output_panel.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.output_panel.tag_config("error", foreground="red")
         self.output_panel.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
     def pause_selected_script(self):
@@ -428,11 +731,13 @@ class SchedulerApp:
         selected = self.script_list_tree.selection()
         if selected:
             for item in selected:
-                file_name = self.script_list_tree.item(item, "values")[0]
-                self.scheduler.pause_script(file_name)
-                logging.info(f"Paused script: {file_name}")
-                messagebox.showinfo("Pause Script", f"Script '{file_name}' has been paused.")
-            self.refresh_gui()
+                script = self.script_manager.get_script_by_path(item)
+                if script is None:  # Removed since the tree was last refreshed
+                    continue
+                self.scheduler.pause_script(script["file_path"])
+                logging.info(f"Paused script: {script['file_path']}")
+                messagebox.showinfo("Pause Script", f"Script '{script['basename']}' has been paused.")
+            self._invalidate_gui()
         else:
             messagebox.showwarning("Warning", "No script selected!")
 
@@ -442,17 +747,19 @@ class SchedulerApp:
 
         if selected:
             for item in selected:
-                file_name = self.script_list_tree.item(item, "values")[0]
+                script = self.script_manager.get_script_by_path(item)
+                if script is None:  # Removed since the tree was last refreshed
+                    continue
 
                 # Check if the script is already active
-                if not self.scheduler.is_script_paused(file_name):
-                    messagebox.showinfo("Resume Script", f"Script '{file_name}' is already active.")
+                if not self.scheduler.is_script_paused(script["file_path"]):
+                    messagebox.showinfo("Resume Script", f"Script '{script['basename']}' is already active.")
                     return
 
                 # Resume the script
-                self.scheduler.resume_script(file_name)  # Call resume_script only once
-                messagebox.showinfo("Resume Script", f"Script '{file_name}' has been resumed.")
-                self.refresh_gui()  # Update GUI
+                self.scheduler.resume_script(script["file_path"])  # Call resume_script only once
+                messagebox.showinfo("Resume Script", f"Script '{script['basename']}' has been resumed.")
+                self._invalidate_gui()  # Update GUI
                 return  # Exit after processing one script
         else:
             messagebox.showwarning("Warning", "No script selected!")
@@ -470,24 +777,9 @@ class SchedulerApp:
             messagebox.showerror("Error", f"Failed to switch themes: {str(e)}")
 
     def search_scripts(self, query):
-        """Filter scripts by file name or path."""
-        self.script_list_tree.delete(*self.script_list_tree.get_children())
-        for script in self.script_manager.scripts:
-            if query.lower() in os.path.basename(script["file_path"]).lower() or query.lower() in script[
-                "file_path"].lower():
-                file_name = os.path.basename(script["file_path"])
-                time_display = script["time"] or "Unscheduled"
-                self.script_list_tree.insert("", tk.END, values=(file_name, time_display, script["file_path"]))
-
-    def auto_refresh_gui(self):
-        """Automatically refresh the GUI."""
-        self.refresh_gui()
-        # Determine the current scheduler state and update the status only if it changes
-        if self.scheduler.is_running:
-            self.update_scheduler_status(SchedulerStatus.RUNNING, color="green")
-        else:
-            self.update_scheduler_status(SchedulerStatus.NOT_RUNNING, color="red")
-        self.root.after(5000, self.auto_refresh_gui)
+        """Filter scripts by file name or path; an empty query shows every script."""
+        self._search_query = query.lower()
+        self.update_script_tree()
 
     def open_log_viewer(self):
         """Open a new window to display logs."""
@@ -512,8 +804,13 @@ class SchedulerApp:
 
     def clear_logs(self):
         """Clear the log file."""
-        with open(LOG_FILE, "w") as log_file:
-            log_file.write("")
+        # Truncate through the open handler rather than reopening the file
+        self._log_handler.acquire()
+        try:
+            self._log_handler.stream.seek(0)
+            self._log_handler.stream.truncate()
+        finally:
+            self._log_handler.release()
         logging.info("Log file cleared.")
         messagebox.showinfo("Logs", "Log file has been cleared.")
 
@@ -523,19 +820,31 @@ class SchedulerApp:
         thread.start()
 
     def _load_logs(self, log_text_widget):
-        """Actual implementation for loading logs."""
+        """
+        Actual implementation for loading logs.
+
+        Only the last LOG_TAIL_BYTES of the file are read, so opening the viewer
+        takes the same time however long the log has grown. The text is handed
+        to the Tk thread with root.after, since Tk is not thread-safe.
+        """
         try:
-            with open(LOG_FILE, "r") as log_file:
+            with open(LOG_FILE, "rb") as log_file:
+                size = log_file.seek(0, os.SEEK_END)
+                log_file.seek(max(0, size - LOG_TAIL_BYTES))
                 logs = log_file.read()
-            log_text_widget.config(state=tk.NORMAL)
-            log_text_widget.delete(1.0, tk.END)
-            log_text_widget.insert(tk.END, logs)
-            log_text_widget.config(state=tk.DISABLED)
+            if size > LOG_TAIL_BYTES:
+                logs = logs[logs.find(b"\n") + 1:]  # Drop the partial first line
+            logs = logs.decode("utf-8", errors="replace")
         except FileNotFoundError:
-            log_text_widget.config(state=tk.NORMAL)
-            log_text_widget.delete(1.0, tk.END)
-            log_text_widget.insert(tk.END, "Log file not found. Logs will appear here after execution.")
-            log_text_widget.config(state=tk.DISABLED)
+            logs = "Log file not found. Logs will appear here after execution."
+        self.root.after(0, self._show_logs, log_text_widget, logs)
+
+    def _show_logs(self, log_text_widget, logs):
+        """Replace the log viewer's text."""
+        log_text_widget.config(state=tk.NORMAL)
+        log_text_widget.delete(1.0, tk.END)
+        log_text_widget.insert(tk.END, logs)
+        log_text_widget.config(state=tk.DISABLED)
 
     def update_scheduler_status(self, status, color="red"):
         """Update the scheduler status label and button states."""
@@ -547,39 +856,74 @@ class SchedulerApp:
             self.pause_button.config(state=tk.NORMAL if status == SchedulerStatus.RUNNING else tk.DISABLED)
             self.resume_button.config(state=tk.NORMAL if status == SchedulerStatus.PAUSED else tk.DISABLED)
 
+    def _sync_tree(self, tree, rows, shown):
+        """
+        Make a Treeview show the given rows, touching only the rows that changed.
+
+        Every Treeview call is a round trip into Tcl, so rows are inserted,
+        deleted or updated individually instead of rebuilding the whole list,
+        and rows are only moved when the order has changed. Each row's key is
+        its item ID, so a selected item maps straight back to its row.
+
+        :param tree: The Treeview to update
+        :param rows: List of (key, values, tags) tuples in display order; keys are strings
+        :param shown: Dict of key -> (values, tags) for the rows currently in the tree; updated in place
+        """
+        keys = {key for key, _, _ in rows}
+        for key in [key for key in shown if key not in keys]:
+            del shown[key]
+            tree.delete(key)
+        reorder = list(shown) != [key for key, _, _ in rows if key in shown]
+
+        updated = {}
+        for index, (key, values, tags) in enumerate(rows):
+            row = shown.get(key)
+            if row is None:
+                tree.insert("", index, iid=key, values=values, tags=tags)
+            else:
+                if row != (values, tags):
+                    tree.item(key, values=values, tags=tags)
+                if reorder:
+                    tree.move(key, "", index)
+            updated[key] = (values, tags)
+        shown.clear()
+        shown.update(updated)
+
     def update_script_tree(self):
         """Refresh the script list and highlight scheduled scripts."""
-        self.script_list_tree.delete(*self.script_list_tree.get_children())
-        for script in sorted(self.script_manager.scripts, key=lambda s: s["time"] or "99:99"):
-            file_name = os.path.basename(script["file_path"])
+        query = self._search_query
+        rows = []
+        for script in self.script_manager.sorted_scripts:
+            file_name = script["basename"]
+            if query and query not in file_name.lower() and query not in script["file_path"].lower():
+                continue
             time_display = script["time"] or "Unscheduled"
             frequency_display = script.get("frequency", "Not Set")
             weekday_display = script.get("weekday", "N/A")
-            row_id = self.script_list_tree.insert(
-                "", tk.END, values=(file_name, time_display, frequency_display, weekday_display, script["file_path"])
-            )
-            if self.scheduler.is_script_paused(file_name):
-                self.script_list_tree.item(row_id, tags=("paused",))
+            if self.scheduler.is_script_paused(script["file_path"]):
+                tags = ("paused",)
             elif script["time"]:
-                self.script_list_tree.item(row_id, tags=("scheduled",))
-        self.script_list_tree.tag_configure("scheduled", background="lightgreen")
-        self.script_list_tree.tag_configure("paused", background="lightcoral")
+                tags = ("scheduled",)
+            else:
+                tags = ()
+            values = (file_name, time_display, frequency_display, weekday_display, script["file_path"])
+            rows.append((script["file_path"], values, tags))
+        self._sync_tree(self.script_list_tree, rows, self._script_rows)
 
     def update_scheduled_jobs_tree(self):
         """Refresh the scheduled jobs list and exclude paused jobs."""
-        self.scheduled_jobs_tree.delete(*self.scheduled_jobs_tree.get_children())  # Clear current entries
-        for job in sorted(self.scheduler.jobs, key=lambda j: j["time"] or "99:99"):
-            file_name = job["file_name"]
+        rows = []
+        for job in self.scheduler.jobs:
+            file_path = job["file_path"]
 
             # Skip paused jobs
-            if self.scheduler.is_script_paused(file_name):
+            if self.scheduler.is_script_paused(file_path):
                 continue
 
             weekday_display = job["weekday"].capitalize() if job["weekday"] else ""
-            self.scheduled_jobs_tree.insert(
-                "", tk.END,
-                values=(file_name, job["time"], f"{job['frequency']} {weekday_display}")
-            )
+            values = (os.path.basename(file_path), job["time"], f"{job['frequency']} {weekday_display}")
+            rows.append((file_path, values, ()))
+        self._sync_tree(self.scheduled_jobs_tree, rows, self._job_rows)
 
     def start_scheduler(self):
         """Start the scheduler."""
@@ -609,7 +953,7 @@ class SchedulerApp:
     def clear_scheduled_jobs(self):
         self.scheduler.clear_jobs()
         self.update_scheduler_status("Not Running", color="red")
-        self.update_scheduled_jobs_tree()
+        self._invalidate_gui()
         messagebox.showinfo("Clear Jobs", "All scheduled jobs have been cleared.")
 
     def schedule_script(self):
@@ -617,51 +961,51 @@ class SchedulerApp:
         selected = self.script_list_tree.selection()
         if selected:
             for item in selected:
-                file_name = self.script_list_tree.item(item, "values")[0]
+                script = self.script_manager.get_script_by_path(item)
+                if script is None:  # Removed since the tree was last refreshed
+                    continue
+                file_path = script["file_path"]
                 time = simpledialog.askstring("Schedule Time", "Enter time (HH:MM, 24-hour format):")
                 if time:
-                    try:
-                        datetime.strptime(time, "%H:%M")  # Validate time format
-
-                        # Ask for frequency
-                        frequency = simpledialog.askstring(
-                            "Frequency",
-                            "Enter frequency (daily, weekly):",
-                            initialvalue="daily"
+                    time = _parse_time(time)
+                    if time is None:
+                        messagebox.showerror("Error", "Invalid time format. Please enter time as HH:MM.")
+                        continue
+
+                    # Ask for frequency
+                    frequency = simpledialog.askstring(
+                        "Frequency",
+                        "Enter frequency (daily, weekly):",
+                        initialvalue="daily"
+                    ).lower()
+                    if frequency not in ["daily", "weekly"]:
+                        messagebox.showerror("Error", "Invalid frequency. Use 'daily' or 'weekly'.")
+                        return
+
+                    # For weekly frequency, ask for the weekday
+                    weekday = None
+                    if frequency == "weekly":
+                        weekday = simpledialog.askstring(
+                            "Weekday",
+                            "Enter the weekday (e.g., monday, tuesday, ...):",
+                            initialvalue="monday"
                         ).lower()
-                        if frequency not in ["daily", "weekly"]:
-                            messagebox.showerror("Error", "Invalid frequency. Use 'daily' or 'weekly'.")
+                        if weekday not in ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday",
+                                           "sunday"]:
+                            messagebox.showerror("Error", "Invalid weekday. Use a valid day of the week.")
                             return
 
-                        # For weekly frequency, ask for the weekday
-                        weekday = None
-                        if frequency == "weekly":
-                            weekday = simpledialog.askstring(
-                                "Weekday",
-                                "Enter the weekday (e.g., monday, tuesday, ...):",
-                                initialvalue="monday"
-                            ).lower()
-                            if weekday not in ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday",
-                                               "sunday"]:
-                                messagebox.showerror("Error", "Invalid weekday. Use a valid day of the week.")
-                                return
-
-                        # Update script manager and schedule the job
-                        if self.script_manager.update_script(file_name, time):
-                            script = next((s for s in self.script_manager.scripts if
-                                           os.path.basename(s["file_path"]) == file_name), None)
-                            if script:
-                                script["frequency"] = frequency  # Save frequency
-                                script["weekday"] = weekday if frequency == "weekly" else None  # Save weekday if weekly
-                                self.script_manager.save_scripts()  # Save changes to scripts.json
-
-                            job_func = partial(self.run_script, file_name=file_name)
-                            self.scheduler.add_job_with_frequency(time, job_func, file_name, frequency, weekday)
-                            self.refresh_gui()
-                            messagebox.showinfo("Success",
-                                                f"Scheduled {file_name} at {time} ({frequency} {weekday if weekday else ''}).")
-                    except ValueError:
-                        messagebox.showerror("Error", "Invalid time format. Please enter time as HH:MM.")
+                    # Update script manager and schedule the job
+                    if self.script_manager.update_script(file_path, time):
+                        script["frequency"] = frequency  # Save frequency
+                        script["weekday"] = weekday if frequency == "weekly" else None  # Save weekday if weekly
+                        self.script_manager.save_scripts()  # Save changes to scripts.json
+
+                        self.scheduler.add_job_with_frequency(time, self.run_script, file_path, frequency, weekday)
+                        self._invalidate_gui()
+                        messagebox.showinfo("Success",
+                                            f"Scheduled {script['basename']} at {time} "
+                                            f"({frequency} {weekday if weekday else ''}).")
         else:
             messagebox.showwarning("Warning", "No script selected!")
 
@@ -670,7 +1014,7 @@ class SchedulerApp:
         file_path = filedialog.askopenfilename(filetypes=[("Python Files", "*.py")])
         if file_path and file_path.endswith(".py") and os.path.exists(file_path):
             if self.script_manager.add_script(file_path):
-                self.update_script_tree()
+                self._invalidate_gui()
                 logging.info(f"Added script: {file_path}")
                 messagebox.showinfo("Success", "Script added successfully!")
             else:
@@ -685,9 +1029,8 @@ class SchedulerApp:
         selected = self.script_list_tree.selection()
         if selected:
             for item in selected:
-                file_name = self.script_list_tree.item(item, "values")[0]
-                self.script_manager.remove_script(file_name)
-            self.update_script_tree()
+                self.script_manager.remove_script(item)
+            self._invalidate_gui()
             messagebox.showinfo("Success", "Selected script(s) removed!")
         else:
             messagebox.showwarning("Warning", "No script selected!")
@@ -697,50 +1040,138 @@ class SchedulerApp:
         selected = self.script_list_tree.selection()
         if selected:
             for item in selected:
-                file_name = self.script_list_tree.item(item, "values")[0]
-                self.run_script(file_name)
+                self.run_script(item)
         else:
             messagebox.showwarning("Warning", "No script selected!")
 
-    def run_script(self, file_name):
-        """Run the specified script asynchronously and display its output."""
-        thread = threading.Thread(target=self._run_script, args=(file_name,), daemon=True)
-        thread.start()
+    def _get_pool(self):
+        """Create the warm interpreter pool on first use."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                             mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def run_script(self, file_path):
+        """
+        Run the specified script asynchronously and display its output.
+
+        :param file_path: The path of the script file
+        """
+        self.scheduler.run_coroutine(self._run_script(file_path))
 
-    def _run_script(self, file_name):
-        """Actual implementation for running a script."""
-        script = next((s for s in self.script_manager.scripts if os.path.basename(s["file_path"]) == file_name), None)
+    async def _run_script(self, file_path):
+        """
+        Actual implementation for running a script, on the scheduler's event loop.
+
+        Scripts run as unbuffered child processes awaited on the loop, so several
+        can run at once, and their output is shown as it is produced.
+        Scripts marked "warm" in scripts.json instead run in a pool of long-lived
+        interpreters, skipping interpreter startup, and show their output when
+        they finish. Tk is not thread-safe, so GUI updates are handed to the Tk
+        thread with root.after. Problems are reported in the output panel rather
+        than in dialogs, so an unattended run never waits on someone to click OK.
+        """
+        script = self.script_manager.get_script_by_path(file_path)
         if script:
-            if not os.path.exists(script["file_path"]):
+            file_name = script["basename"]
+            if not self.script_manager.path_exists(script["file_path"]):
                 logging.error(f"Script not found: {script['file_path']}")
-                messagebox.showerror("Error", f"Script not found: {script['file_path']}")
+                self.root.after(0, self._append_output, f"Script not found: {script['file_path']}\n", True)
                 return
+            self.root.after(0, self._append_output, f"Running {script['basename']}\n")
             try:
-                process = subprocess.Popen(
-                    ["python", script["file_path"]],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                )
-                stdout, stderr = process.communicate()
-                self.display_output(file_name, stdout, stderr)
+                if script.get("warm"):
+                    stdout, stderr = await asyncio.get_running_loop().run_in_executor(
+                        self._get_pool(), _exec_script_worker, script["file_path"])
+                    self.root.after(0, self.display_output, file_name, stdout, stderr)
+                else:
+                    process = await asyncio.create_subprocess_exec(
+                        *script["argv"],
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE,
+                    )
+                    await asyncio.gather(
+                        self._stream_output(process.stdout),
+                        self._stream_output(process.stderr, error=True),
+                    )
+                    returncode = await process.wait()
+                    self.root.after(0, self._append_output,
+                                    f"{file_name} finished with exit code {returncode}\n", returncode != 0)
                 logging.info(f"Executed script: {file_name}")
             except Exception as e:
                 error_trace = traceback.format_exc()
                 logging.error(f"Failed to run script: {file_name}, Error: {e}\nTraceback: {error_trace}")
-                messagebox.showerror("Error", f"Failed to run script: {file_name}. Check logs for details.")
+                self.root.after(0, self._append_output,
+                                f"Failed to run script: {file_name}. Check logs for details.\n", True)
 
-    def display_output(self, file_name, stdout, stderr):
-        """Display script output in the output panel."""
+    async def _stream_output(self, stream, error=False):
+        """
+        Forward a child process's output to the output panel as it arrives.
+
+        Output is forwarded a line at a time. A line longer than the stream's
+        buffer limit is forwarded in pieces, so memory stays bounded.
+
+        :param stream: The process's stdout or stderr StreamReader
+        :param error: Whether to show the output in the error color
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        while True:
+            try:
+                chunk = await stream.readuntil(b"\n")
+            except asyncio.IncompleteReadError as e:
+                chunk = e.partial  # Output ended without a newline
+            except asyncio.LimitOverrunError as e:
+                chunk = await stream.read(e.consumed)
+            text = decoder.decode(chunk, final=not chunk)
+            if text:
+                self.root.after(0, self._append_output, text, error)
+            if not chunk:
+                break
+
+    def _append_output(self, text, error=False):
+        """
+        Append text to the output panel.
+
+        Text is queued and inserted every OUTPUT_FLUSH_MS, so a script writing
+        many short lines costs one widget update per batch rather than per line.
+
+        :param text: The text to append
+        :param error: Whether to show the line in the error color
+        """
+        self._output_buffer.append((text, error))
+        if not self._output_flush_pending:
+            self._output_flush_pending = True
+            self.root.after(OUTPUT_FLUSH_MS, self._flush_output)
+
+    def _flush_output(self):
+        """Insert the queued output into the output panel with a single Text.insert call."""
+        self._output_flush_pending = False
+        args = []
+        for error, group in itertools.groupby(self._output_buffer, key=lambda item: item[1]):
+            args += ["".join(text for text, _ in group), ("error",) if error else ()]
+        self._output_buffer.clear()
+        if not args:
+            return
         self.output_panel.config(state=tk.NORMAL)
-        self.output_panel.delete(1.0, tk.END)
-        self.output_panel.insert(tk.END, f"Output for {file_name}:\n\n")
+        self.output_panel.insert(tk.END, *args)
+        self._trim_output()
+        self.output_panel.see(tk.END)
+        self.output_panel.config(state=tk.DISABLED)
+
+    def _trim_output(self):
+        """Drop the oldest lines so the output panel holds at most MAX_OUTPUT_LINES."""
+        line_count = int(self.output_panel.index("end-1c").split(".")[0])
+        if line_count > MAX_OUTPUT_LINES:
+            self.output_panel.delete("1.0", f"{line_count - MAX_OUTPUT_LINES + 1}.0")
+
+    def display_output(self, file_name, stdout, stderr):
+        """Append a finished script's output to the output panel."""
+        text = f"Output for {file_name}:\n\n"
         if stdout:
-            self.output_panel.insert(tk.END, f"STDOUT:\n{stdout}\n")
+            text += f"STDOUT:\n{stdout}\n"
+        self._append_output(text)
         if stderr:
-            self.output_panel.insert(tk.END, f"STDERR:\n{stderr}\n", ("error",))
-        self.output_panel.tag_config("error", foreground="red")
-        self.output_panel.config(state=tk.DISABLED)
+            self._append_output(f"STDERR:\n{stderr}\n", error=True)
 
 
 